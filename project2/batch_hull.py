@@ -0,0 +1,186 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def _sort_groups(points: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """
+    Return the point indexes sorted by (group, x, y).
+
+    Groups are contiguous, so a single float key of group and x usually orders everything.
+    When x values collide (or get too close to tell apart inside the key) fall back to a full lexsort.
+    """
+    x = points[:, 0]
+    if len(x) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    low = x.min()
+    spacing = 2 * (x.max() - low) + 1
+    order = np.argsort(groups * spacing + (x - low))
+
+    sorted_x = x[order]
+    sorted_groups = groups[order]
+    if np.all((sorted_groups[1:] != sorted_groups[:-1]) | (sorted_x[1:] > sorted_x[:-1])):
+        return order
+
+    return np.lexsort((points[:, 1], x, groups))
+
+
+# Rounds of vectorized pruning before the groups still changing finish with the sequential chain.
+# Random points settle in a handful of rounds, but a chain can lose a single point per round
+# (points on a parabola with one end pulled below it), which makes pruning alone quadratic.
+MAX_PRUNE_ROUNDS = 32
+
+
+def _sequential_chain(x: list[float], y: list[float], positions: list[int], lower: bool) -> list[int]:
+    # The usual monotone chain over one group's sorted points, with _prune_chain's turn rule
+    chain: list[int] = []  # indexes into x and y
+    for i in range(len(x)):
+        while len(chain) >= 2:
+            a, b = chain[-2], chain[-1]
+            cross = (x[b] - x[a]) * (y[i] - y[a]) - (y[b] - y[a]) * (x[i] - x[a])
+            if (cross > 0) if lower else (cross < 0):
+                break
+            chain.pop()
+        chain.append(i)
+    return [positions[i] for i in chain]
+
+
+def _prune_chain(x: np.ndarray, y: np.ndarray, groups: np.ndarray, lower: bool) -> np.ndarray:
+    """
+    Monotone chain for every group at once.
+
+    `x`, `y` and `groups` are already sorted by (group, x, y).
+    Repeatedly drop every point that does not make a strict turn (left for the lower chain,
+    right for the upper chain) with its surviving neighbors in the same group.
+    A hull vertex always makes that turn with any neighbors, so only non-hull points are dropped,
+    and once nothing is dropped the survivors are exactly the chain.
+    Groups still dropping points after MAX_PRUNE_ROUNDS rounds finish with the sequential chain.
+
+    Return the sorted positions of the chain's points.
+    """
+    kept = np.arange(len(x))
+    finished = []
+    rounds = 0
+    while len(kept) >= 3:
+        if rounds == MAX_PRUNE_ROUNDS:
+            g = groups[kept]
+            for positions in np.split(kept, np.flatnonzero(g[1:] != g[:-1]) + 1):
+                finished.append(np.array(_sequential_chain(
+                    x[positions].tolist(), y[positions].tolist(), positions.tolist(), lower
+                ), dtype=np.int64))
+            kept = kept[:0]
+            break
+        rounds += 1
+
+        g = groups[kept]
+        kx = x[kept]
+        ky = y[kept]
+        interior = np.zeros(len(kept), dtype=bool)
+        interior[1:-1] = (g[:-2] == g[1:-1]) & (g[1:-1] == g[2:])
+
+        cross = np.zeros(len(kept))
+        cross[1:-1] = (kx[1:-1] - kx[:-2]) * (ky[2:] - ky[:-2]) - (ky[1:-1] - ky[:-2]) * (kx[2:] - kx[:-2])
+
+        drop = interior & ((cross <= 0) if lower else (cross >= 0))
+        if not drop.any():
+            break
+
+        # Groups that dropped nothing are done; stop rescanning them
+        changed = np.zeros(groups[-1] + 1, dtype=bool)
+        changed[g[drop]] = True
+        active = changed[g]
+        finished.append(kept[~active])
+        kept = kept[active & ~drop]
+
+    finished.append(kept)
+    return np.sort(np.concatenate(finished))
+
+
+def _compute_hulls(points: np.ndarray, offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    n_groups = len(offsets) - 1
+    groups = np.repeat(np.arange(n_groups), np.diff(offsets))
+
+    # One sort for every group
+    order = _sort_groups(points, groups)
+    groups = groups[order]
+    x = points[order, 0]
+    y = points[order, 1]
+
+    # Repeated points would otherwise survive as zero-length edges
+    if len(order) > 1:
+        distinct = np.ones(len(order), dtype=bool)
+        distinct[1:] = (groups[1:] != groups[:-1]) | (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+        order, groups, x, y = order[distinct], groups[distinct], x[distinct], y[distinct]
+
+    lower = _prune_chain(x, y, groups, lower=True)
+    upper = _prune_chain(x, y, groups, lower=False)
+
+    # Counter-clockwise from the left-most point: the lower chain left to right,
+    # then the upper chain right to left without the two end points it shares with the lower chain
+    upper_groups = groups[upper]
+    is_end = np.ones(len(upper), dtype=bool)
+    if len(upper) > 1:
+        is_end[1:-1] = (upper_groups[:-2] != upper_groups[1:-1]) | (upper_groups[1:-1] != upper_groups[2:])
+    upper = upper[~is_end]
+
+    # Reversing the upper chains puts each one right to left; a stable sort on
+    # (group, chain) then interleaves the chains without disturbing that order
+    vertexes = np.concatenate([lower, upper[::-1]])
+    vertex_groups = groups[vertexes]
+    chain = np.concatenate([np.zeros(len(lower), dtype=np.int64), np.ones(len(upper), dtype=np.int64)])
+    vertexes = vertexes[np.argsort(2 * vertex_groups + chain, kind='stable')]
+
+    hull_offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(vertex_groups, minlength=n_groups), out=hull_offsets[1:])
+
+    return points[order[vertexes]], hull_offsets
+
+
+def _compute_hulls_slice(args: tuple[np.ndarray, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    return _compute_hulls(*args)
+
+
+def compute_hulls(
+        points: np.ndarray,
+        offsets: np.ndarray,
+        workers: int | None = None,
+        groups_per_task: int = 50000
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the convex hull of many point sets at once.
+
+    Group i is `points[offsets[i]:offsets[i + 1]]`, so `offsets` starts at 0 and ends at len(points).
+    With `workers`, groups are split into tasks of `groups_per_task` and fanned out over a process pool.
+
+    Return:
+        - the hull vertexes of every group, concatenated (counter-clockwise from the left-most point,
+          like compute_hull)
+        - the offsets of each group's hull in that array
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(points) or np.any(np.diff(offsets) < 0):
+        raise ValueError('offsets must increase from 0 to the number of points')
+
+    n_groups = len(offsets) - 1
+    if workers is None or workers <= 1 or n_groups <= groups_per_task:
+        return _compute_hulls(points, offsets)
+
+    tasks = []
+    for first in range(0, n_groups, groups_per_task):
+        last = min(first + groups_per_task, n_groups)
+        start, end = offsets[first], offsets[last]
+        tasks.append((points[start:end], offsets[first:last + 1] - start))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_compute_hulls_slice, tasks))
+
+    vertexes = np.concatenate([v for v, _ in results])
+    hull_offsets = [np.zeros(1, dtype=np.int64)]
+    total = 0
+    for v, o in results:
+        hull_offsets.append(o[1:] + total)
+        total += len(v)
+
+    return vertexes, np.concatenate(hull_offsets)
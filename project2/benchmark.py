@@ -0,0 +1,154 @@
+import argparse
+import csv
+import json
+import math
+import statistics
+import tracemalloc
+from time import perf_counter
+from typing import Callable
+
+from generate import generate_random_points, DISTRIBUTIONS
+from convex_hull import hull_from_sorted, monotone_chain_from_sorted, sort_points
+
+Points = list[tuple[float, float]]
+
+# Each engine takes points already in (x, y) order, so sorting can be timed on its own
+ENGINES: dict[str, Callable[[Points], Points]] = {
+    'divide_and_conquer': hull_from_sorted,
+    'monotone_chain': monotone_chain_from_sorted,
+}
+
+SORTS: dict[str, Callable[[Points], Points]] = {
+    'numpy': sort_points,
+    'builtin': sorted,
+}
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def time_engine(sort, engine, points: Points, trials: int) -> tuple[list[float], list[float]]:
+    sort_times = []
+    hull_times = []
+    for _ in range(trials):
+        start = perf_counter()
+        sorted_points = sort(points)
+        middle = perf_counter()
+        engine(sorted_points)
+        end = perf_counter()
+        sort_times.append(middle - start)
+        hull_times.append(end - middle)
+    return sort_times, hull_times
+
+
+def peak_memory(sort, engine, points: Points) -> int:
+    # tracemalloc slows everything down, so this is a separate, untimed run
+    tracemalloc.start()
+    try:
+        engine(sort(points))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def fit_nlogn(sizes: list[int], times: list[float]) -> float:
+    """
+    Least-squares fit of `times ~= c * n log(n)`.
+    Return c.
+    """
+    features = [n * math.log(n) for n in sizes]
+    denominator = sum(f * f for f in features)
+    if denominator == 0:
+        return 0.0
+    return sum(f * t for f, t in zip(features, times)) / denominator
+
+
+def run_benchmark(
+        sizes: list[int],
+        distributions: list[str],
+        engines: list[str],
+        sorts: list[str],
+        trials: int,
+        seed: int | None
+) -> dict:
+    rows = []
+    for distribution in distributions:
+        for n in sizes:
+            points = generate_random_points(distribution, n, seed)
+            for engine_name in engines:
+                for sort_name in sorts:
+                    sort = SORTS[sort_name]
+                    engine = ENGINES[engine_name]
+                    sort_times, hull_times = time_engine(sort, engine, points, trials)
+                    times = [s + h for s, h in zip(sort_times, hull_times)]
+                    row = {
+                        'engine': engine_name,
+                        'sort': sort_name,
+                        'distribution': distribution,
+                        'n': n,
+                        'trials': trials,
+                        'median_time': statistics.median(times),
+                        'median_sort_time': statistics.median(sort_times),
+                        'median_hull_time': statistics.median(hull_times),
+                        'min_time': min(times),
+                        'max_time': max(times),
+                        'peak_memory': peak_memory(sort, engine, points),
+                    }
+                    rows.append(row)
+                    print(f'{engine_name:>20} {sort_name:>8} {distribution:>10} {n:>9}: '
+                          f'{round(row["median_time"], 4)} sec '
+                          f'(sort {round(row["median_sort_time"], 4)}, hull {round(row["median_hull_time"], 4)}), '
+                          f'{row["peak_memory"]} bytes')
+
+    fits = []
+    for engine_name in engines:
+        for sort_name in sorts:
+            for distribution in distributions:
+                matching = [
+                    r for r in rows
+                    if r['engine'] == engine_name and r['sort'] == sort_name and r['distribution'] == distribution
+                ]
+                fits.append({
+                    'engine': engine_name,
+                    'sort': sort_name,
+                    'distribution': distribution,
+                    'nlogn_constant': fit_nlogn(
+                        [r['n'] for r in matching],
+                        [r['median_time'] for r in matching]
+                    ),
+                })
+
+    return {'seed': seed, 'results': rows, 'fits': fits}
+
+
+def write_results(results: dict, json_path: str, csv_path: str | None):
+    with open(json_path, 'w') as file:
+        json.dump(results, file, indent=4)
+
+    if csv_path is not None:
+        with open(csv_path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(results['results'][0].keys()))
+            writer.writeheader()
+            writer.writerows(results['results'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, nargs='+', default=DEFAULT_SIZES, help='The numbers of points to time')
+    parser.add_argument('-d', '--dist', '--distribution', nargs='+', default=DISTRIBUTIONS,
+                        help='The distributions from which to generate points')
+    parser.add_argument('--engine', nargs='+', default=list(ENGINES), choices=list(ENGINES),
+                        help='The hull engines to time')
+    parser.add_argument('--sort', nargs='+', default=list(SORTS), choices=list(SORTS),
+                        help='The sorting stages to time')
+    parser.add_argument('--trials', type=int, default=5, help='Timed runs per configuration')
+    parser.add_argument('--seed', type=int, default=312, help='Random seed')
+    parser.add_argument('--json', default='benchmark.json', help='Where to write the JSON results')
+    parser.add_argument('--csv', default='benchmark.csv', help='Where to write the CSV results')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.n, args.dist, args.engine, args.sort, args.trials, args.seed)
+    write_results(results, args.json, args.csv)
+
+    for fit in results['fits']:
+        print(f'{fit["engine"]:>20} {fit["sort"]:>8} {fit["distribution"]:>10}: time ~= {fit["nlogn_constant"]:.3e} * n log(n)')
@@ -3,6 +3,7 @@
 import sys
 from cmath import inf
 import copy
+import numpy as np
 LARGE_VALUE = sys.float_info.max
 from plotting import draw_line, draw_hull, circle_point, show_plot
 
@@ -102,10 +103,57 @@ def merge_hulls(left_hull: Hull, right_hull: Hull) -> Hull:
 
 # O(nlog(n))
 def compute_hull(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
-    points.sort()
-    hull: Hull = convex_hull(points)
+    return hull_from_sorted(sort_points(points))
+
+# O(nlog(n))
+# `sorted_points` must already be in (x, y) order
+def hull_from_sorted(sorted_points: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    hull: Hull = convex_hull(sorted_points)
     return hull.to_list()
 
+# O(nlog(n))
+# Return a new list of the same points in (x, y) order, leaving `points` untouched.
+# Sorting the x coordinates with numpy is much cheaper than comparing tuples;
+# y only breaks ties, so it is only looked at when some x values repeat.
+def sort_points(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    if len(points) < 2:
+        return list(points)
+
+    xs = np.fromiter((point[0] for point in points), dtype=float, count=len(points))
+    order = np.argsort(xs)
+    sorted_xs = xs[order]
+    if not np.all(sorted_xs[1:] > sorted_xs[:-1]):
+        ys = np.fromiter((point[1] for point in points), dtype=float, count=len(points))
+        order = np.lexsort((ys, xs))
+
+    return [points[i] for i in order.tolist()]
+
+# O(nlog(n))
+# Andrew's monotone chain, used as a second engine to compare against
+def compute_hull_monotone_chain(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    return monotone_chain_from_sorted(sort_points(points))
+
+# O(n)
+# `ordered` must already be in (x, y) order
+def monotone_chain_from_sorted(ordered: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    if len(ordered) < 3:
+        return ordered
+
+    lower: list[tuple[float, float]] = []
+    for point in ordered:
+        while len(lower) >= 2 and turn(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+
+    upper: list[tuple[float, float]] = []
+    for point in reversed(ordered):
+        while len(upper) >= 2 and turn(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+
+    # Counter-clockwise from the left-most point, like Hull.to_list
+    return lower[:-1] + upper[:-1]
+
 # O(nlog(n))
 def convex_hull(points: list[tuple[float,float]]) -> Hull:
     if (len(points) == 1):
@@ -130,3 +178,6 @@ def get_slope(left: Node, right: Node) -> float:
         return float(inf)
     return (y2 - y1) / (x2 - x1)
 
+# Positive if o -> a -> b turns counter-clockwise
+def turn(o: tuple[float, float], a: tuple[float, float], b: tuple[float, float]) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
@@ -1,5 +1,8 @@
 import random
 
+# One name per distribution generate_random_points knows about
+DISTRIBUTIONS = ['uniform', 'guassian', 'circle', 'sphere']
+
 
 def rand1to1():
     return (random.random() - 0.5) * 2  # -1 to 1
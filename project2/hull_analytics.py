@@ -0,0 +1,140 @@
+import math
+from typing import NamedTuple
+
+Point = tuple[float, float]
+
+
+class Rectangle(NamedTuple):
+    area: float
+    perimeter: float
+    corners: list[Point]  # counter-clockwise
+
+
+def _cross(o: Point, a: Point, b: Point) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _dot(a: Point, b: Point) -> float:
+    return a[0] * b[0] + a[1] * b[1]
+
+
+def _sub(a: Point, b: Point) -> Point:
+    return a[0] - b[0], a[1] - b[1]
+
+
+# O(h)
+def diameter(hull: list[Point]) -> tuple[float, Point, Point]:
+    """
+    Farthest pair of points on a counter-clockwise hull (as returned by Hull.to_list).
+
+    Return the distance and the two points.
+    """
+    h = len(hull)
+    if h == 1:
+        return 0.0, hull[0], hull[0]
+    if h == 2:
+        return math.dist(hull[0], hull[1]), hull[0], hull[1]
+
+    best = (0.0, hull[0], hull[0])
+    j = 1
+    for i in range(h):
+        p, q = hull[i], hull[(i + 1) % h]
+        # Move j to the point farthest from edge p -> q
+        while _cross(p, q, hull[(j + 1) % h]) > _cross(p, q, hull[j % h]):
+            j += 1
+        # On a tie the edge is parallel to the one at j, so both of its ends are antipodal too
+        for a in (p, q):
+            for b in (hull[j % h], hull[(j + 1) % h]):
+                d = math.dist(a, b)
+                if d > best[0]:
+                    best = (d, a, b)
+
+    return best
+
+
+# O(h)
+def width(hull: list[Point]) -> tuple[float, Point, Point]:
+    """
+    Minimum distance between two parallel lines that enclose a counter-clockwise hull.
+
+    Return the width and the hull edge one of the lines runs along.
+    """
+    h = len(hull)
+    if h < 3:
+        return 0.0, hull[0], hull[-1]
+
+    best = (math.inf, hull[0], hull[1])
+    j = 1
+    for i in range(h):
+        p, q = hull[i], hull[(i + 1) % h]
+        while _cross(p, q, hull[(j + 1) % h]) > _cross(p, q, hull[j % h]):
+            j += 1
+        distance = _cross(p, q, hull[j % h]) / math.dist(p, q)
+        if distance < best[0]:
+            best = (distance, p, q)
+
+    return best
+
+
+def _enclosing_rectangles(hull: list[Point]) -> list[Rectangle]:
+    """
+    The smallest rectangle with one side along each hull edge.
+    The minimum-area and the minimum-perimeter enclosing rectangles are both among them
+    (not necessarily the same one).
+    """
+    h = len(hull)
+    rectangles = []
+    right = top = left = 0
+    for i in range(h):
+        p, q = hull[i], hull[(i + 1) % h]
+        length = math.dist(p, q)
+        u = ((q[0] - p[0]) / length, (q[1] - p[1]) / length)
+        n = (-u[1], u[0])  # points into the hull
+
+        # Each pointer only ever moves forward, so all three go around the hull once in total
+        right = max(right, i + 1)
+        while _dot(_sub(hull[(right + 1) % h], hull[right % h]), u) > 0:
+            right += 1
+        top = max(top, right)
+        while _dot(_sub(hull[(top + 1) % h], hull[top % h]), n) > 0:
+            top += 1
+        left = max(left, top)
+        while _dot(_sub(hull[(left + 1) % h], hull[left % h]), u) < 0:
+            left += 1
+
+        low = _dot(_sub(hull[left % h], p), u)
+        high = _dot(_sub(hull[right % h], p), u)
+        height = _dot(_sub(hull[top % h], p), n)
+
+        base_low = (p[0] + low * u[0], p[1] + low * u[1])
+        base_high = (p[0] + high * u[0], p[1] + high * u[1])
+        corners = [
+            base_low,
+            base_high,
+            (base_high[0] + height * n[0], base_high[1] + height * n[1]),
+            (base_low[0] + height * n[0], base_low[1] + height * n[1]),
+        ]
+        rectangles.append(Rectangle((high - low) * height, 2 * ((high - low) + height), corners))
+
+    return rectangles
+
+
+def _degenerate_rectangle(hull: list[Point]) -> Rectangle:
+    if len(hull) == 1:
+        return Rectangle(0.0, 0.0, [hull[0]] * 4)
+    a, b = hull
+    return Rectangle(0.0, 2 * math.dist(a, b), [a, b, b, a])
+
+
+# O(h)
+def min_area_rectangle(hull: list[Point]) -> Rectangle:
+    if len(hull) < 3:
+        return _degenerate_rectangle(hull)
+    return min(_enclosing_rectangles(hull), key=lambda rectangle: rectangle.area)
+
+
+# O(h)
+def min_perimeter_rectangle(hull: list[Point]) -> Rectangle:
+    if len(hull) < 3:
+        return _degenerate_rectangle(hull)
+    return min(_enclosing_rectangles(hull), key=lambda rectangle: rectangle.perimeter)
@@ -0,0 +1,81 @@
+import numpy as np
+
+from convex_hull import Hull
+
+
+class HullIndex:
+    """
+    Answers "is this point inside the hull?" in O(log(h)) per point.
+
+    The hull is split at its left-most and right-most vertexes into a lower and an upper chain,
+    both running left to right. A query point is inside (or on the boundary) when it lies
+    between the x extremes, on or above the lower chain edge spanning its x value,
+    and on or below the upper chain edge spanning it.
+    """
+
+    def __init__(self, hull_points: list[tuple[float, float]]):
+        if len(hull_points) == 0:
+            raise ValueError('Cannot index an empty hull')
+
+        hull = np.asarray(hull_points, dtype=float).reshape(-1, 2)
+
+        # Start from the left-most (then lowest) vertex and go counter-clockwise
+        start = np.lexsort((hull[:, 1], hull[:, 0]))[0]
+        hull = np.roll(hull, -start, axis=0)
+        x, y = hull[:, 0], hull[:, 1]
+        signed_area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+        if signed_area < 0:
+            hull = np.concatenate([hull[:1], hull[:0:-1]])
+
+        # The right-most (then highest) vertex ends the lower chain and starts the upper one
+        end = np.lexsort((hull[:, 1], hull[:, 0]))[-1]
+        lower = hull[:end + 1]
+        upper = np.concatenate([hull[end:], hull[:1]])[::-1]
+
+        # Drop vertical edges at the ends: the lower chain keeps the lowest point at each x,
+        # the upper chain the highest
+        lower = lower[np.concatenate([[True], lower[1:, 0] != lower[:-1, 0]])]
+        upper = upper[np.concatenate([upper[1:, 0] != upper[:-1, 0], [True]])]
+
+        self.lower = lower
+        self.upper = upper
+        self.x_min = hull[0, 0]
+        self.x_max = hull[end, 0]
+
+    @classmethod
+    def from_hull(cls, hull: Hull) -> 'HullIndex':
+        return cls(hull.to_list())
+
+    def contains(self, points) -> np.ndarray:
+        """
+        Return a boolean mask: True where the matching point is inside or on the hull.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        qx, qy = points[:, 0], points[:, 1]
+
+        inside = (qx >= self.x_min) & (qx <= self.x_max)
+        inside &= _side(self.lower, qx, qy) >= 0
+        inside &= _side(self.upper, qx, qy) <= 0
+        return inside
+
+    def __contains__(self, point: tuple[float, float]) -> bool:
+        return bool(self.contains([point])[0])
+
+
+def _side(chain: np.ndarray, qx: np.ndarray, qy: np.ndarray) -> np.ndarray:
+    """
+    Cross product of each query point against the chain edge that spans its x value.
+    Positive above the edge, negative below.
+    """
+    if len(chain) == 1:
+        # Every hull vertex shares one x value; compare heights directly
+        return qy - chain[0, 1]
+
+    edge = np.clip(np.searchsorted(chain[:, 0], qx, side='right') - 1, 0, len(chain) - 2)
+    p1 = chain[edge]
+    p2 = chain[edge + 1]
+    return (p2[:, 0] - p1[:, 0]) * (qy - p1[:, 1]) - (p2[:, 1] - p1[:, 1]) * (qx - p1[:, 0])
+
+
+def points_in_hull(hull_points: list[tuple[float, float]], points) -> np.ndarray:
+    return HullIndex(hull_points).contains(points)
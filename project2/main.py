@@ -5,6 +5,7 @@ import sys
 
 from generate import generate_random_points
 from convex_hull import compute_hull
+from stream_hull import compute_hull_from_file, DEFAULT_CHUNK_SIZE
 from plotting import plot_points, draw_hull, title, show_plot
 
 
@@ -20,6 +21,18 @@ def main(n: int, distribution: str, seed: int | None):
     title(f'{n} {distribution} points: {round(end - start, 4)} seconds')
     show_plot()
 
+
+def main_file(path: str, chunk_size: int):
+    # The points may not fit in memory, so only the hull is drawn
+    start = time()
+    hull_points = compute_hull_from_file(path, chunk_size)
+    end = time()
+
+    print(f'{len(hull_points)} hull points: {round(end - start, 4)} seconds')
+    draw_hull(hull_points)
+    title(f'{path}: {round(end - start, 4)} seconds')
+    show_plot()
+
 if __name__ == '__main__':
 
     # To debug or run in your IDE
@@ -29,6 +42,10 @@ if __name__ == '__main__':
 
     parser = argparse.ArgumentParser()
     parser.add_argument('-n', type=int, help='The number of points to generate', default=10000)
+    parser.add_argument('-f', '--file',
+                        help='Read points from this .npy or raw float64 file instead of generating them')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Points per chunk when reading from --file')
     parser.add_argument('-d', '--dist', '--distribution',
                         help='The distribution from which to generate points',
                         default='uniform'
@@ -47,4 +64,7 @@ if __name__ == '__main__':
         plt.ion()
         
 
-    main(args.n, args.dist, args.seed)
+    if args.file is not None:
+        main_file(args.file, args.chunk_size)
+    else:
+        main(args.n, args.dist, args.seed)
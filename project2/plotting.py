@@ -1,7 +1,17 @@
 import matplotlib.pyplot as plt
+import numpy as np
 
+# Above this many points, plot_points draws a density image instead of a scatter
+DENSITY_THRESHOLD = 50000
+
+
+def plot_points(points: list[tuple[float, float]], density: bool | None = None, **kwargs):
+    if density is None:
+        density = len(points) > DENSITY_THRESHOLD
+    if density:
+        plot_density(points, **kwargs)
+        return
 
-def plot_points(points: list[tuple[float, float]], **kwargs):
     if 'c' not in kwargs:
         kwargs['c'] = 'k'
 
@@ -9,6 +19,35 @@ def plot_points(points: list[tuple[float, float]], **kwargs):
     plt.scatter(xx, yy, **kwargs)
 
 
+def plot_density(points: list[tuple[float, float]], bins: int = 400, **kwargs):
+    # Bin the points into a fixed-size image so drawing costs the same no matter how many there are
+    if isinstance(points, np.ndarray):
+        xx, yy = points[:, 0], points[:, 1]
+    else:
+        xx = np.fromiter((point[0] for point in points), dtype=float, count=len(points))
+        yy = np.fromiter((point[1] for point in points), dtype=float, count=len(points))
+
+    counts, x_edges, y_edges = np.histogram2d(xx, yy, bins=bins)
+
+    for k, v in {
+        'cmap': 'Greys',
+        'norm': 'log',
+        'aspect': 'auto',
+        'interpolation': 'nearest'
+    }.items():
+        if k not in kwargs:
+            kwargs[k] = v
+    kwargs.pop('c', None)
+
+    # Empty bins are masked so they show as background
+    plt.imshow(
+        np.ma.masked_equal(counts.T, 0),
+        origin='lower',
+        extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+        **kwargs
+    )
+
+
 def draw_hull(points: list[tuple[float, float]], **kwargs):
     xx, yy = zip(*points)
     xx = [*xx, points[0][0]]
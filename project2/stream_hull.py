@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+
+from batch_hull import compute_hulls
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def load_points(path: str | Path) -> np.ndarray:
+    """
+    Memory-map an (n, 2) array of points without reading it.
+
+    `.npy` files are opened with np.load; anything else is read as raw
+    little-endian float64 x, y pairs.
+    """
+    path = Path(path)
+    if path.suffix == '.npy':
+        points = np.load(path, mmap_mode='r')
+    else:
+        points = np.memmap(path, dtype='<f8', mode='r')
+        if len(points) % 2 != 0:
+            raise ValueError(f'{path} does not hold a whole number of (x, y) pairs')
+        points = points.reshape(-1, 2)
+
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f'Expected an (n, 2) array of points in {path}, got shape {points.shape}')
+
+    return points
+
+
+def _hull_of(points: np.ndarray) -> np.ndarray:
+    vertexes, _ = compute_hulls(points, [0, len(points)])
+    return vertexes
+
+
+def compute_hull_streaming(points: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[float, float]]:
+    """
+    Compute the convex hull of `points` one chunk at a time.
+
+    Only the current chunk and the vertexes of the partial hulls found so far are ever in memory.
+    Once those vertexes add up to more than a chunk, they are replaced by their own hull.
+
+    Return the hull counter-clockwise from the left-most point, like compute_hull.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+
+    candidates: list[np.ndarray] = []
+    n_candidates = 0
+    for start in range(0, len(points), chunk_size):
+        chunk = np.asarray(points[start:start + chunk_size], dtype=float)
+        partial = _hull_of(chunk)
+        candidates.append(partial)
+        n_candidates += len(partial)
+
+        if n_candidates > chunk_size:
+            candidates = [_hull_of(np.concatenate(candidates))]
+            n_candidates = len(candidates[0])
+
+    if not candidates:
+        return []
+
+    hull = _hull_of(np.concatenate(candidates))
+    return [tuple(point) for point in hull.tolist()]
+
+
+def compute_hull_from_file(path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[float, float]]:
+    return compute_hull_streaming(load_points(path), chunk_size)
@@ -1,8 +1,17 @@
+import itertools
+import math
+import time
+
+import numpy as np
 from byu_pytest_utils import max_score
 
-from test_utils import is_convex_hull
+from test_utils import is_convex_hull, is_convex_hull_fast, is_point_in_polygon
 
-from convex_hull import compute_hull
+from convex_hull import compute_hull, compute_hull_monotone_chain, sort_points
+from batch_hull import compute_hulls
+from stream_hull import compute_hull_from_file
+from hull_query import HullIndex
+from hull_analytics import diameter, width, min_area_rectangle, min_perimeter_rectangle
 from generate import generate_random_points
 
 
@@ -32,3 +41,155 @@ def test_guassian_distribution_large():
     points = generate_random_points('guassian', 20000, 312)
     candidate_hull = compute_hull(points)
     assert is_convex_hull(candidate_hull, points)
+
+
+@max_score(5)
+def test_compute_hull_leaves_input_alone():
+    points = generate_random_points('uniform', 1000, 312)
+    original = list(points)
+    compute_hull(points)
+    assert points == original
+
+    ties = [(1.0, 2.0), (0.0, 5.0), (1.0, -1.0), (0.0, 5.0), (-3.0, 0.0)]
+    assert sort_points(ties) == sorted(ties)
+
+
+@max_score(5)
+def test_monotone_chain_matches():
+    for distribution in ['uniform', 'guassian', 'circle', 'sphere']:
+        points = generate_random_points(distribution, 5000, 312)
+        candidate_hull = compute_hull_monotone_chain(points)
+        assert is_convex_hull_fast(candidate_hull, points)
+        assert candidate_hull == compute_hull(points)
+
+
+@max_score(5)
+def test_fast_validator_matches():
+    for distribution in ['uniform', 'guassian', 'circle']:
+        points = generate_random_points(distribution, 1000, 312)
+        hull = compute_hull(points)
+        candidates = [
+            hull,
+            hull[::-1],
+            hull[:-1],
+            hull[:2] + [hull[3], hull[2]] + hull[4:],
+            hull[:2],
+        ]
+        for candidate_hull in candidates:
+            assert is_convex_hull_fast(candidate_hull, points) == is_convex_hull(candidate_hull, points)
+
+
+@max_score(5)
+def test_fast_validator_matches_degenerate():
+    # Integer grids put points on the hull's edges, and some candidates wind around twice
+    rng = np.random.default_rng(312)
+    for _ in range(500):
+        size = rng.choice([2, 3, 4, 6])
+        points = list({(float(x), float(y)) for x, y in rng.integers(0, size + 1, (rng.integers(3, 13), 2))})
+        if len(points) < 3:
+            continue
+        hull = compute_hull_monotone_chain(sorted(points))
+        on_edges = [point for point in points if point not in hull]
+        candidates = [hull, hull[::-1], hull + hull, hull[::2] + hull[1::2]]
+        if on_edges:
+            candidates.append(hull[:1] + on_edges[:1] + hull[1:])
+        candidates.append([points[i] for i in rng.permutation(len(points))[:rng.integers(3, len(points) + 1)]])
+        for candidate_hull in candidates:
+            assert is_convex_hull_fast(candidate_hull, points) == is_convex_hull(candidate_hull, points)
+
+    square = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]
+    assert not is_convex_hull(square + square, square)
+    assert not is_convex_hull_fast(square + square, square)
+    pentagon = [(0.0, 0.0), (2.0, 0.0), (3.0, 2.0), (1.0, 3.0), (-1.0, 2.0)]
+    star = pentagon[::2] + pentagon[1::2]
+    assert not is_convex_hull(star, pentagon) and not is_convex_hull_fast(star, pentagon)
+
+
+@max_score(5)
+def test_uniform_distribution_massive():
+    points = generate_random_points('uniform', 200000, 312)
+    candidate_hull = compute_hull(points)
+    assert is_convex_hull_fast(candidate_hull, points)
+
+
+@max_score(5)
+def test_batched_hulls():
+    groups = [generate_random_points('uniform', n, seed) for seed, n in enumerate([0, 1, 2, 3, 10, 100, 7])]
+    groups.append([(0.0, 0.0), (1.0, 1.0), (2.0, 2.0), (1.0, 1.0)])
+    offsets = [0]
+    for points in groups:
+        offsets.append(offsets[-1] + len(points))
+
+    flat = [point for points in groups for point in points]
+    for workers in [None, 2]:
+        vertexes, hull_offsets = compute_hulls(flat, offsets, workers=workers, groups_per_task=3)
+        for i, points in enumerate(groups):
+            hull = [tuple(v) for v in vertexes[hull_offsets[i]:hull_offsets[i + 1]].tolist()]
+            assert hull == compute_hull_monotone_chain(sorted(set(points)))
+
+
+@max_score(5)
+def test_batched_hulls_adversarial():
+    # Points on a parabola with one end pulled past it: pruning could only drop one point per round
+    x = np.arange(20000, dtype=float)
+    parabola = np.column_stack([x, (x / len(x)) ** 2])
+    groups = [
+        np.vstack([parabola, [len(x), -10.0]]),
+        np.vstack([parabola * [1, -1], [len(x), 10.0]]),
+    ]
+    offsets = [0, len(groups[0]), len(groups[0]) + len(groups[1])]
+
+    start = time.perf_counter()
+    vertexes, hull_offsets = compute_hulls(np.concatenate(groups), offsets)
+    assert time.perf_counter() - start < 1
+    for i, points in enumerate(groups):
+        hull = [tuple(v) for v in vertexes[hull_offsets[i]:hull_offsets[i + 1]].tolist()]
+        assert hull == compute_hull_monotone_chain([tuple(p) for p in points.tolist()])
+
+
+@max_score(5)
+def test_streaming_hull(tmp_path):
+    points = generate_random_points('guassian', 50000, 312)
+    expected = compute_hull(points)
+
+    np.save(tmp_path / 'points.npy', np.array(points))
+    assert compute_hull_from_file(tmp_path / 'points.npy', chunk_size=1000) == expected
+
+    np.array(points, dtype='<f8').tofile(tmp_path / 'points.bin')
+    assert compute_hull_from_file(tmp_path / 'points.bin', chunk_size=7) == expected
+
+
+@max_score(5)
+def test_hull_index():
+    points = generate_random_points('guassian', 2000, 312)
+    hull = compute_hull(points)
+    index = HullIndex(hull)
+    assert index.contains(points).all()
+
+    queries = np.random.default_rng(312).uniform(-2, 2, (2000, 2))
+    expected = [is_point_in_polygon(tuple(q), hull) for q in queries]
+    assert index.contains(queries).tolist() == expected
+
+    square = HullIndex([(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert (1, 0.5) in square
+    assert (1, -0.5) not in square
+    assert (0, 1.5) not in square
+
+
+@max_score(5)
+def test_rotating_calipers():
+    points = generate_random_points('uniform', 500, 312)
+    hull = compute_hull(points)
+
+    farthest = max(math.dist(a, b) for a, b in itertools.combinations(hull, 2))
+    assert math.isclose(diameter(hull)[0], farthest)
+
+    square = [(0.0, 0.0), (2.0, 0.0), (2.0, 1.0), (1.0, 1.0), (0.0, 1.0)]
+    assert width(square)[0] == 1.0
+    assert min_area_rectangle(square).area == 2.0
+    assert min_perimeter_rectangle(square).perimeter == 6.0
+
+    # Every point (nudged towards the middle for rounding) should be inside the minimum-area rectangle
+    rectangle = HullIndex(min_area_rectangle(hull).corners)
+    shrunk = [(x * (1 - 1e-9), y * (1 - 1e-9)) for x, y in points]
+    assert rectangle.contains(shrunk).all()
@@ -3,6 +3,8 @@
 #  the plotting library will be full of no-op functions
 import sys
 
+import numpy as np
+
 plotting = type(sys)('plotting')
 plotting.plot_points = lambda *args, **kwargs: None
 plotting.draw_hull = lambda *args, **kwargs: None
@@ -36,12 +38,23 @@ def is_point_in_polygon(point: tuple[float, float], polygon: list[tuple[float, f
     return wn != 0
 
 
+def winds_once(polygon: list[tuple[float, float]]) -> bool:
+    """ Check that the polygon goes around at most once: its x direction changes at most twice. """
+    directions = [(b[0] > a[0]) - (b[0] < a[0]) for a, b in zip(polygon, polygon[1:] + polygon[:1])]
+    directions = [direction for direction in directions if direction != 0]
+    return sum(a != b for a, b in zip(directions, directions[-1:] + directions[:-1])) <= 2
+
+
 def is_convex_polygon(polygon: list[tuple[float, float]]) -> bool:
     """ Check if the given polygon is convex. """
     n = len(polygon)
     if n < 3:
         return False
 
+    # Turning the same way at every vertex also allows stars that wind around more than once
+    if not winds_once(polygon):
+        return False
+
     sign = None
     for i in range(n):
         o = polygon[i]
@@ -76,3 +89,80 @@ def is_convex_hull(candidate_hull: list[tuple[float, float]], points: list[tuple
             return False
 
     return True
+
+
+def is_convex_hull_fast(candidate_hull: list[tuple[float, float]], points: list[tuple[float, float]]) -> bool:
+    """
+    Same answer as `is_convex_hull`, in O(n log h) instead of O(n * h).
+
+    Convexity is checked in one vectorized pass over the hull's turns.
+    Each point is then located in an angular wedge around a pivot inside the hull
+    (binary search over the vertex angles) and tested against that wedge's edge and its neighbors.
+    Points too close to an edge to call that way, where `is_convex_hull`'s own rules decide
+    (its winding number counts some boundary points as inside and some as outside),
+    go through `is_point_in_polygon`; candidates the wedges cannot describe
+    (repeated vertices, spikes) go through `is_convex_hull`.
+    """
+
+    candidate_set = set(candidate_hull)
+    if not candidate_set.issubset(set(points)):
+        return False
+
+    hull = np.asarray(candidate_hull, dtype=float)
+    if len(hull) < 3:
+        return False
+
+    # Turn at every vertex, with the same sign rule as is_convex_polygon
+    a = np.roll(hull, -1, axis=0)
+    b = np.roll(hull, -2, axis=0)
+    turns = (a[:, 0] - hull[:, 0]) * (b[:, 1] - hull[:, 1]) - (a[:, 1] - hull[:, 1]) * (b[:, 0] - hull[:, 0])
+    positive = turns > 0
+    if positive.any() and not positive.all():
+        return False
+
+    # Same as winds_once
+    dx = np.sign(a[:, 0] - hull[:, 0])
+    dx = dx[dx != 0]
+    if np.count_nonzero(dx != np.roll(dx, 1)) > 2:
+        return False
+
+    if not turns.any():
+        # All vertices are collinear: nothing has area to be inside of
+        return set(points).issubset(candidate_set)
+
+    if not positive.all():
+        hull = hull[::-1]  # make it counter-clockwise
+
+    # The vertex average of a convex polygon with area is strictly inside it
+    pivot = hull.mean(axis=0)
+    vertex_angles = np.arctan2(hull[:, 1] - pivot[1], hull[:, 0] - pivot[0])
+    start = np.argmin(vertex_angles)
+    hull = np.roll(hull, -start, axis=0)
+    vertex_angles = np.roll(vertex_angles, -start)
+    if not np.all(np.diff(vertex_angles) > 0):
+        return is_convex_hull(candidate_hull, points)
+
+    pts = np.asarray(points, dtype=float)
+    point_angles = np.arctan2(pts[:, 1] - pivot[1], pts[:, 0] - pivot[0])
+    # Wedge i lies between vertex i and vertex i + 1 (wrapping around)
+    wedge = np.searchsorted(vertex_angles, point_angles, side='right') - 1
+    wedge[wedge < 0] = len(hull) - 1
+
+    # A point inside a convex polygon is inside every edge; testing the neighboring edges too
+    # covers points that rounding put in the wedge next to theirs
+    side = np.full(len(pts), np.inf)
+    for shift in (-1, 0, 1):
+        first = (wedge + shift) % len(hull)
+        p1 = hull[first]
+        p2 = hull[(first + 1) % len(hull)]
+        side = np.minimum(side, (p2[:, 0] - p1[:, 0]) * (pts[:, 1] - p1[:, 1])
+                          - (p2[:, 1] - p1[:, 1]) * (pts[:, 0] - p1[:, 0]))
+
+    extent = max(np.ptp(pts, axis=0).max(), 1.0)
+    tolerance = 1e-9 * extent ** 2
+    if np.any(side < -tolerance):
+        return False
+    return all(
+        points[i] in candidate_set or is_point_in_polygon(points[i], candidate_hull)
+        for i in np.flatnonzero(side <= tolerance)
+    )
@@ -0,0 +1,118 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Iterable, Iterator
+
+from csr_graph import CSRGraph
+from search_stats import BatchStats
+from shared_graph import SharedCSRGraph, attach_worker, worker_graph
+
+INFINITY = float('inf')
+
+def route_from(graph: CSRGraph, source: int, targets: list[int]) -> list[tuple[list[int], float]]:
+    """
+    One Dijkstra search from `source`, run until every one of `targets` is settled.
+
+    Return a (path, cost) pair per target, as find_shortest_path_with_heap_csr would.
+    """
+    n = graph.num_nodes
+    indptr = graph.indptr
+    indices = graph.indices
+    weights = graph.weights
+
+    dist: list[float] = [INFINITY] * n
+    predecessor: list[int] = [-1] * n
+    settled: list[bool] = [False] * n
+    dist[source] = 0
+    remaining = set(targets)
+    queue = [(0, source)]
+    while queue and remaining:
+        distance, node = heapq.heappop(queue)
+        if settled[node]:
+            continue
+        settled[node] = True
+        remaining.discard(node)
+
+        start, end = indptr[node], indptr[node + 1]
+        for neighbor, weight in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+            new_distance = distance + weight
+            if new_distance < dist[neighbor]:
+                dist[neighbor] = new_distance
+                predecessor[neighbor] = node
+                heapq.heappush(queue, (new_distance, neighbor))
+
+    results = []
+    for target in targets:
+        if dist[target] == INFINITY:
+            results.append(([], INFINITY))
+            continue
+        path_to_target: list[int] = []
+        next_node = target
+        while next_node != -1:
+            path_to_target.append(next_node)
+            next_node = predecessor[next_node]
+        path_to_target.reverse()
+        results.append((path_to_target, dist[target]))
+    return results
+
+
+def route_in_worker(group: tuple[int, list[int]]) -> list[tuple[list[int], float]]:
+    """
+    route_from(source, targets) for a `group` of (source, targets), in a pool started with attach_worker.
+    """
+    return route_from(worker_graph(), *group)
+
+
+def route_batch(
+        graph: CSRGraph,
+        queries: Iterable[tuple[int, int]],
+        workers: int | None = None,
+        sources_per_task: int = 8,
+        stats: BatchStats | None = None
+) -> Iterator[tuple[list[int], float]]:
+    """
+    Answer many (source, target) queries, yielding a (path, cost) pair per query in input order.
+
+    Queries are grouped by source so each source is searched once. The groups are spread over
+    `workers` processes (all cores by default) that read the graph from shared memory,
+    `sources_per_task` sources per task. Results are yielded as soon as every earlier query
+    has been answered. With workers=1 everything runs in this process.
+
+    If given, `stats` is filled in once the whole batch has been yielded.
+    """
+    start = perf_counter()
+    queries = list(queries)
+    groups: dict[int, list[int]] = {}  # source -> indexes of its queries, in input order
+    for index, (source, _) in enumerate(queries):
+        groups.setdefault(source, []).append(index)
+    # dicts keep insertion order, so groups come in order of their first query
+    tasks = [(source, [queries[index][1] for index in indexes]) for source, indexes in groups.items()]
+
+    workers = workers or os.cpu_count() or 1
+    shared = pool = None
+    try:
+        if workers > 1 and len(tasks) > 1:
+            shared = SharedCSRGraph(graph)
+            pool = ProcessPoolExecutor(workers, initializer=attach_worker, initargs=(shared.spec,))
+            answers = pool.map(route_in_worker, tasks, chunksize=sources_per_task)
+        else:
+            answers = (route_from(graph, *task) for task in tasks)
+
+        finished: dict[int, tuple[list[int], float]] = {}
+        next_index = 0
+        for indexes, results in zip(groups.values(), answers):
+            finished.update(zip(indexes, results))
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if shared is not None:
+            shared.close()
+
+    if stats is not None:
+        stats.n_queries = len(queries)
+        stats.n_searches = len(tasks)
+        stats.time = perf_counter() - start
@@ -0,0 +1,531 @@
+import argparse
+import csv
+import dataclasses
+import json
+import random
+import statistics
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from generate import generate_graph, generate_graph_csr
+from csr_graph import CSRGraph
+from network_routing import (find_shortest_path_with_heap, find_shortest_path_with_heap_csr,
+                             find_shortest_path_astar, admissible_scale)
+from network_routing import (_find_shortest_path_csr, find_shortest_path, PRIORITY_QUEUES,
+                             find_shortest_path_delta_stepping, find_shortest_path_with_array,
+                             find_shortest_path_with_array_csr, find_shortest_path_bidirectional,
+                             reverse_graph)
+from parallel_routing import ParallelDeltaStepping
+from landmarks import Landmarks, find_shortest_path_alt
+from batch_routing import route_batch, route_from
+from heap_priority_queue import HeapPriorityQueue
+from dary_heap_priority_queue import DaryHeapPriorityQueue
+from search_stats import SearchStats, BatchStats
+
+
+def _prepare_bidirectional(graph, positions):
+    reverse = reverse_graph(graph)
+    return lambda s, t, stats: find_shortest_path_bidirectional(graph, s, t, reverse, stats)
+
+
+def _prepare_astar(graph, positions):
+    scale = min(1.0, admissible_scale(graph, positions))
+    return lambda s, t, stats: find_shortest_path_astar(graph, positions, s, t, scale, stats=stats)
+
+
+# Every finder the sweep can time: the graph form it takes ('dict' or 'csr') and how to prepare it
+# for one graph. prepare(graph, positions) does the per-graph work (reverse graph, A* scale) once,
+# outside the timed runs, and returns find(source, target, stats).
+# Finders without counters ignore `stats`.
+# The ones that need heavier preprocessing (ALT, contraction hierarchies) are compared by the other commands.
+FINDERS = {
+    'heap': ('dict', lambda graph, positions: lambda s, t, stats: find_shortest_path_with_heap(graph, s, t, stats)),
+    'array': ('dict', lambda graph, positions: lambda s, t, stats: find_shortest_path_with_array(graph, s, t, stats)),
+    **{
+        queue: ('dict', lambda graph, positions, queue=queue:
+                lambda s, t, stats: find_shortest_path(graph, s, t, queue, stats))
+        for queue in PRIORITY_QUEUES if queue not in ('heap', 'array')
+    },
+    'heap_csr': ('csr', lambda graph, positions:
+                 lambda s, t, stats: find_shortest_path_with_heap_csr(graph, s, t, stats)),
+    'array_csr': ('csr', lambda graph, positions:
+                  lambda s, t, stats: find_shortest_path_with_array_csr(graph, s, t, stats)),
+    'bidirectional': ('dict', _prepare_bidirectional),
+    'astar': ('dict', _prepare_astar),
+    'delta_stepping': ('dict', lambda graph, positions:
+                       lambda s, t, stats: find_shortest_path_delta_stepping(graph, s, t)),
+}
+
+
+def traced_size(build) -> tuple[object, int]:
+    """
+    Call `build` and return its result along with how many bytes it left allocated.
+    """
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def estimate_dict_bytes(graph: CSRGraph, sample: int = 1000) -> int:
+    """
+    Roughly how many bytes graph.to_dict() would take, without building all of it:
+    the dicts of `sample` evenly spaced nodes are built under tracemalloc and scaled up to every node.
+    """
+    n = graph.num_nodes
+    if n == 0:
+        return 0
+    nodes = np.unique(np.linspace(0, n - 1, min(sample, n)).astype(np.int64)).tolist()
+    indptr = graph.indptr
+
+    def build():
+        return {
+            node: dict(zip(graph.indices[indptr[node]:indptr[node + 1]].tolist(),
+                           graph.weights[indptr[node]:indptr[node + 1]].tolist()))
+            for node in nodes
+        }
+
+    _, sampled = traced_size(build)
+    return round(sampled * n / len(nodes))
+
+
+def median_time(find, graph, source: int, target: int, trials: int) -> tuple[float, float]:
+    times = []
+    cost = None
+    for _ in range(trials):
+        start = perf_counter()
+        _, cost = find(graph, source, target)
+        times.append(perf_counter() - start)
+    return statistics.median(times), cost
+
+
+def compare_representations(seed: int, size: int, density: float, noise: float,
+                            source: int, target: int, trials: int) -> dict:
+    """
+    Memory and Dijkstra runtime of the dict graph against the same graph as a CSRGraph.
+    The dict graph's memory is estimated (see estimate_dict_bytes) rather than traced,
+    which would hold a second copy of it.
+    """
+    _, csr = generate_graph_csr(seed, size, density, noise)
+    graph = csr.to_dict()
+
+    dict_time, dict_cost = median_time(find_shortest_path_with_heap, graph, source, target, trials)
+    csr_time, csr_cost = median_time(find_shortest_path_with_heap_csr, csr, source, target, trials)
+
+    return {
+        'size': size,
+        'density': density,
+        'edges': csr.num_edges,
+        'dict_bytes_estimate': estimate_dict_bytes(csr),
+        'csr_bytes': csr.nbytes,
+        'dict_time': dict_time,
+        'csr_time': csr_time,
+        'same_cost': dict_cost == csr_cost,
+    }
+
+
+def compare_astar(seed: int, size: int, density: float, noise: float, queries: int, weight: float,
+                  landmarks: int = 8) -> dict:
+    """
+    Average settled nodes and cost over random queries for plain Dijkstra (A* with no heuristic),
+    A* with the unscaled straight-line heuristic, A* with the admissibility check, weighted A*,
+    and ALT with `landmarks` landmarks.
+    """
+    positions, graph = generate_graph(seed, size, density, noise)
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+    scale = admissible_scale(graph, positions)
+    checked = min(1.0, scale)
+
+    variants = {
+        'dijkstra': dict(scale=0),
+        'astar': dict(scale=1),
+        'astar_checked': dict(scale=checked),
+        'weighted_astar': dict(scale=checked, weight=weight),
+    }
+    finders = {
+        name: lambda source, target, stats, kwargs=kwargs:
+            find_shortest_path_astar(graph, positions, source, target, stats=stats, **kwargs)
+        for name, kwargs in variants.items()
+    }
+    if landmarks:
+        alt = Landmarks.select(graph, landmarks, seed)
+        finders['alt'] = lambda source, target, stats: find_shortest_path_alt(graph, alt, source, target, stats)
+
+    row = {'size': size, 'density': density, 'noise': noise, 'admissible_scale': scale}
+    optimal_costs = []
+    for name, find in finders.items():
+        settled = 0
+        costs = []
+        for source, target in pairs:
+            stats = SearchStats()
+            _, cost = find(source, target, stats)
+            settled += stats.n_nodes_settled
+            costs.append(cost)
+        if name == 'dijkstra':
+            optimal_costs = costs
+        row[f'{name}_settled'] = settled / queries
+        # Worst ratio to the optimal cost over the reachable queries (1 means always optimal)
+        ratios = [c / o for c, o in zip(costs, optimal_costs) if 0 < o < float('inf')]
+        row[f'{name}_worst_ratio'] = max(ratios, default=1.0)
+    return row
+
+
+def compare_arity(seed: int, size: int, density: float, noise: float,
+                  arities: list[int], queries: int, trials: int) -> dict:
+    """
+    Median time of full searches with HeapPriorityQueue and with d-ary heaps of each arity.
+    Dense graphs make most relaxations decrease-keys.
+    """
+    _, graph = generate_graph_csr(seed, size, density, noise)
+    rng = random.Random(seed)
+    # Node -1 is never popped, so every search runs until it has settled the whole graph
+    sources = [rng.randrange(size) for _ in range(queries)]
+
+    queues = {'binary_heap': HeapPriorityQueue}
+    for arity in arities:
+        queues[f'{arity}-ary'] = lambda arity=arity: DaryHeapPriorityQueue(arity)
+
+    row = {'size': size, 'density': density, 'edges': graph.num_edges}
+    for name, make_queue in queues.items():
+        times = []
+        for _ in range(trials):
+            start = perf_counter()
+            for source in sources:
+                _find_shortest_path_csr(graph, source, -1, make_queue())
+            times.append(perf_counter() - start)
+        row[name] = statistics.median(times)
+    return row
+
+
+def compare_queues(seed: int, size: int, density: float, noise: float,
+                   queues: list[str], queries: int, trials: int, delta: float | None = None) -> dict:
+    """
+    Median time of `queries` random point-to-point searches with each priority-queue strategy,
+    and with Δ-stepping if `delta` is given.
+    """
+    _, graph = generate_graph(seed, size, density, noise)
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+
+    row = {'size': size, 'density': density}
+    for queue in queues:
+        times = []
+        for _ in range(trials):
+            start = perf_counter()
+            for source, target in pairs:
+                find_shortest_path(graph, source, target, queue)
+            times.append(perf_counter() - start)
+        row[queue] = statistics.median(times)
+
+    contenders = list(queues)
+    if delta is not None:
+        times = []
+        for _ in range(trials):
+            start = perf_counter()
+            for source, target in pairs:
+                find_shortest_path_delta_stepping(graph, source, target, delta)
+            times.append(perf_counter() - start)
+        row['delta_stepping'] = statistics.median(times)
+        contenders.append('delta_stepping')
+
+    row['fastest'] = min(contenders, key=lambda name: row[name])
+    return row
+
+
+def compare_workers(seed: int, size: int, density: float, noise: float,
+                    workers: list[int], delta: float, queries: int, trials: int) -> dict:
+    """
+    Median time of full single-source parallel Δ-stepping runs with each worker count,
+    and the speedup over one worker. Pool start-up is not timed.
+    """
+    _, graph = generate_graph_csr(seed, size, density, noise)
+    rng = random.Random(seed)
+    sources = [rng.randrange(size) for _ in range(queries)]
+
+    row = {'size': size, 'density': density, 'edges': graph.num_edges}
+    for count in workers:
+        with ParallelDeltaStepping(graph, count, delta) as engine:
+            times = []
+            for _ in range(trials):
+                start = perf_counter()
+                for source in sources:
+                    engine.distances(source)
+                times.append(perf_counter() - start)
+        row[f'{count}_workers'] = statistics.median(times)
+
+    baseline = row.get('1_workers')
+    if baseline is not None:
+        for count in workers:
+            row[f'{count}_speedup'] = baseline / row[f'{count}_workers']
+    return row
+
+
+def compare_batch(seed: int, size: int, density: float, noise: float,
+                  queries: int, sources: int, workers: list[int]) -> dict:
+    """
+    Queries per second for a batch of `queries` random queries from `sources` distinct sources,
+    looping over route_from one query at a time and with route_batch at each worker count.
+    Both run the same search, so the difference is only the grouping by source and the workers.
+    """
+    _, graph = generate_graph_csr(seed, size, density, noise)
+    rng = random.Random(seed)
+    starts = [rng.randrange(size) for _ in range(sources)]
+    batch = [(rng.choice(starts), rng.randrange(size)) for _ in range(queries)]
+
+    row = {'size': size, 'density': density, 'queries': queries, 'sources': sources}
+    start = perf_counter()
+    for source, target in batch:
+        route_from(graph, source, [target])
+    row['loop_qps'] = queries / (perf_counter() - start)
+
+    for count in workers:
+        stats = BatchStats()
+        for _ in route_batch(graph, batch, count, stats=stats):
+            pass
+        row[f'{count}_workers_qps'] = stats.queries_per_second
+    return row
+
+
+def run_sweep(sizes: list[int], densities: list[float], noises: list[float], finders: list[str],
+              queries: int, trials: int, seed: int) -> list[dict]:
+    """
+    One row per graph and finder.
+
+    Graphs are generated straight into CSR form (generate_graph_csr); the dict form is built
+    from it only when a dict finder is asked for, so CSR-only sweeps fit far larger graphs.
+    Generation, that conversion and each finder's per-graph preparation are timed on their own,
+    and the dict size is an estimate
+    (see estimate_dict_bytes). Routing times are the median over `trials` runs of the same
+    `queries` (source, target) pairs, drawn from `seed`.
+    One more run, under tracemalloc and with a SearchStats, gives the peak memory of the
+    searches and their counters; it is not part of the timings.
+    """
+    needs_dict = any(FINDERS[name][0] == 'dict' for name in finders)
+    rows = []
+    for size in sizes:
+        for density in densities:
+            for noise in noises:
+                start = perf_counter()
+                positions, csr = generate_graph_csr(seed, size, density, noise)
+                generate_time = perf_counter() - start
+                graph = to_dict_time = None
+                if needs_dict:
+                    start = perf_counter()
+                    graph = csr.to_dict()
+                    to_dict_time = perf_counter() - start
+
+                rng = random.Random(seed)
+                pairs = [(rng.randrange(size), rng.randrange(size)) for _ in range(queries)]
+                graph_row = {
+                    'size': size, 'density': density, 'noise': noise, 'seed': seed, 'edges': csr.num_edges,
+                    'generate_time': generate_time, 'to_dict_time': to_dict_time,
+                    'dict_bytes_estimate': estimate_dict_bytes(csr), 'csr_bytes': csr.nbytes,
+                }
+
+                for name in finders:
+                    form, prepare = FINDERS[name]
+                    start = perf_counter()
+                    find = prepare(graph if form == 'dict' else csr, positions)
+                    prepare_time = perf_counter() - start
+
+                    times = []
+                    for _ in range(trials):
+                        start = perf_counter()
+                        for source, target in pairs:
+                            find(source, target, None)
+                        times.append(perf_counter() - start)
+
+                    stats = SearchStats()
+                    costs = []
+                    tracemalloc.start()
+                    try:
+                        for source, target in pairs:
+                            costs.append(find(source, target, stats)[1])
+                        _, peak_memory = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+
+                    median = statistics.median(times)
+                    rows.append({
+                        **graph_row,
+                        'finder': name,
+                        'prepare_time': prepare_time,
+                        'median_time': median,
+                        'time_per_query': median / queries,
+                        'peak_memory': peak_memory,
+                        # Finders without counters leave them empty rather than zero
+                        **{key: value if stats != SearchStats() else None
+                           for key, value in dataclasses.asdict(stats).items()},
+                        # The same for every exact finder; a quick check that they agree
+                        'total_cost': round(sum(cost for cost in costs if cost < float('inf')), 9),
+                    })
+    return rows
+
+
+def write_results(results: list[dict], json_path: str | None, csv_path: str | None):
+    if json_path is not None:
+        with open(json_path, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    if csv_path is not None and results:
+        # Rows from different commands or options may not all have the same columns
+        fieldnames = list(dict.fromkeys(key for row in results for key in row))
+        with open(csv_path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    representation = subparsers.add_parser('representation', help='Compare dict and CSR graphs')
+    representation.add_argument('-n', type=int, nargs='+', default=[1000, 10000], help='Graph sizes')
+    representation.add_argument('--density', type=float, default=0.01, help='Fraction of non-inf edges')
+    representation.add_argument('--noise', type=float, default=0.02, help='How non-euclidean are the edge weights')
+    representation.add_argument('--seed', type=int, default=312, help='Random seed')
+    representation.add_argument('--source', type=int, default=2, help='Starting node')
+    representation.add_argument('--target', type=int, default=9, help='Target node')
+    representation.add_argument('--trials', type=int, default=3, help='Timed runs per finder')
+    representation.add_argument('--json', default=None, help='Where to write the results')
+
+    astar = subparsers.add_parser('astar', help='Settled nodes of A* against plain Dijkstra')
+    astar.add_argument('-n', type=int, nargs='+', default=[1000, 5000], help='Graph sizes')
+    astar.add_argument('--density', type=float, default=0.002, help='Fraction of non-inf edges')
+    astar.add_argument('--noise', type=float, nargs='+', default=[0, 0.02], help='Noise levels')
+    astar.add_argument('--seed', type=int, default=312, help='Random seed')
+    astar.add_argument('--queries', type=int, default=50, help='Random (source, target) pairs per graph')
+    astar.add_argument('--weight', type=float, default=1.5, help='Heuristic weight for weighted A*')
+    astar.add_argument('--landmarks', type=int, default=8, help='Landmarks for ALT (0 to skip it)')
+    astar.add_argument('--json', default=None, help='Where to write the results')
+
+    arity = subparsers.add_parser('arity', help='Time d-ary heaps of several arities on dense graphs')
+    arity.add_argument('-n', type=int, nargs='+', default=[1000, 3000], help='Graph sizes')
+    arity.add_argument('--density', type=float, default=0.5, help='Fraction of non-inf edges')
+    arity.add_argument('--noise', type=float, default=0.02, help='How non-euclidean are the edge weights')
+    arity.add_argument('--arity', type=int, nargs='+', default=[2, 4, 8], help='Arities to time')
+    arity.add_argument('--seed', type=int, default=312, help='Random seed')
+    arity.add_argument('--queries', type=int, default=3, help='Sources per timed run')
+    arity.add_argument('--trials', type=int, default=3, help='Timed runs per queue')
+    arity.add_argument('--json', default=None, help='Where to write the results')
+
+    queues = subparsers.add_parser('queues', help='Time every priority-queue strategy across sizes and densities')
+    queues.add_argument('-n', type=int, nargs='+', default=[1000, 5000], help='Graph sizes')
+    queues.add_argument('--density', type=float, nargs='+', default=[0.001, 0.01, 0.1], help='Fractions of non-inf edges')
+    queues.add_argument('--noise', type=float, default=0.02, help='How non-euclidean are the edge weights')
+    queues.add_argument('--queue', nargs='+', default=list(PRIORITY_QUEUES), choices=list(PRIORITY_QUEUES),
+                        help='Priority queues to time')
+    queues.add_argument('--delta', type=float, default=0.1, help='Bucket width for Δ-stepping (0 to skip it)')
+    queues.add_argument('--seed', type=int, default=312, help='Random seed')
+    queues.add_argument('--queries', type=int, default=5, help='Random (source, target) pairs per timed run')
+    queues.add_argument('--trials', type=int, default=3, help='Timed runs per queue')
+    queues.add_argument('--json', default=None, help='Where to write the results')
+
+    parallel = subparsers.add_parser('parallel', help='Speedup of parallel Δ-stepping per worker count')
+    parallel.add_argument('-n', type=int, nargs='+', default=[100000, 1000000], help='Graph sizes')
+    parallel.add_argument('--density', type=float, default=0.00002, help='Fraction of non-inf edges')
+    parallel.add_argument('--noise', type=float, default=0.02, help='How non-euclidean are the edge weights')
+    parallel.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker counts to time')
+    parallel.add_argument('--delta', type=float, default=0.01, help='Bucket width')
+    parallel.add_argument('--seed', type=int, default=312, help='Random seed')
+    parallel.add_argument('--queries', type=int, default=1, help='Sources per timed run')
+    parallel.add_argument('--trials', type=int, default=3, help='Timed runs per worker count')
+    parallel.add_argument('--json', default=None, help='Where to write the results')
+
+    batch = subparsers.add_parser('batch', help='Throughput of batch routing against a loop of single queries')
+    batch.add_argument('-n', type=int, nargs='+', default=[10000, 100000], help='Graph sizes')
+    batch.add_argument('--density', type=float, default=0.0005, help='Fraction of non-inf edges')
+    batch.add_argument('--noise', type=float, default=0.02, help='How non-euclidean are the edge weights')
+    batch.add_argument('--queries', type=int, default=200, help='Queries per batch')
+    batch.add_argument('--sources', type=int, default=20, help='Distinct sources in the batch')
+    batch.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Worker counts to time')
+    batch.add_argument('--seed', type=int, default=312, help='Random seed')
+    batch.add_argument('--json', default=None, help='Where to write the results')
+
+    sweep = subparsers.add_parser('sweep', help='Time every finder over sizes, densities and noise levels')
+    sweep.add_argument('-n', type=int, nargs='+', default=[1000, 10000], help='Graph sizes')
+    sweep.add_argument('--density', type=float, nargs='+', default=[0.001, 0.01], help='Fractions of non-inf edges')
+    sweep.add_argument('--noise', type=float, nargs='+', default=[0, 0.02], help='Noise levels')
+    sweep.add_argument('--finder', nargs='+', default=list(FINDERS), choices=list(FINDERS), help='Finders to time')
+    sweep.add_argument('--seed', type=int, default=312, help='Random seed')
+    sweep.add_argument('--queries', type=int, default=5, help='Random (source, target) pairs per timed run')
+    sweep.add_argument('--trials', type=int, default=3, help='Timed runs per finder')
+    sweep.add_argument('--json', default='sweep.json', help='Where to write the results')
+    sweep.add_argument('--csv', default='sweep.csv', help='Where to write the results as CSV')
+
+    args = parser.parse_args()
+
+    if args.command == 'representation':
+        results = []
+        for n in args.n:
+            row = compare_representations(args.seed, n, args.density, args.noise, args.source, args.target, args.trials)
+            results.append(row)
+            print(f'n={n} ({row["edges"]} edges): '
+                  f'dict ~{row["dict_bytes_estimate"] / 1e6:.1f} MB, {round(row["dict_time"], 4)} sec | '
+                  f'csr {row["csr_bytes"] / 1e6:.1f} MB, {round(row["csr_time"], 4)} sec')
+
+    if args.command == 'astar':
+        results = []
+        for n in args.n:
+            for noise in args.noise:
+                row = compare_astar(args.seed, n, args.density, noise, args.queries, args.weight, args.landmarks)
+                results.append(row)
+                print(f'n={n} noise={noise} (admissible scale {round(row["admissible_scale"], 3)}): '
+                      f'settled dijkstra {row["dijkstra_settled"]:.1f}, '
+                      f'astar {row["astar_settled"]:.1f} (worst {row["astar_worst_ratio"]:.3f}x), '
+                      f'checked {row["astar_checked_settled"]:.1f}, '
+                      f'weighted {row["weighted_astar_settled"]:.1f} (worst {row["weighted_astar_worst_ratio"]:.3f}x)'
+                      + (f', alt {row["alt_settled"]:.1f} (worst {row["alt_worst_ratio"]:.3f}x)' if 'alt_settled' in row else ''))
+
+    if args.command == 'arity':
+        results = []
+        for n in args.n:
+            row = compare_arity(args.seed, n, args.density, args.noise, args.arity, args.queries, args.trials)
+            results.append(row)
+            timings = ', '.join(f'{k} {round(v, 4)}' for k, v in row.items() if k not in ('size', 'density', 'edges'))
+            print(f'n={n} ({row["edges"]} edges): {timings} sec')
+
+    if args.command == 'queues':
+        results = []
+        for n in args.n:
+            for density in args.density:
+                row = compare_queues(args.seed, n, density, args.noise, args.queue, args.queries, args.trials,
+                                     args.delta or None)
+                results.append(row)
+                timings = ', '.join(f'{k} {round(v, 4)}' for k, v in row.items() if k not in ('size', 'density', 'fastest'))
+                print(f'n={n} density={density}: {timings} sec -> {row["fastest"]}')
+
+    if args.command == 'parallel':
+        results = []
+        for n in args.n:
+            row = compare_workers(args.seed, n, args.density, args.noise, args.workers, args.delta,
+                                  args.queries, args.trials)
+            results.append(row)
+            timings = ', '.join(f'{count}: {round(row[f"{count}_workers"], 4)} sec '
+                                f'({row.get(f"{count}_speedup", float("nan")):.2f}x)' for count in args.workers)
+            print(f'n={n} ({row["edges"]} edges): {timings}')
+
+    if args.command == 'batch':
+        results = []
+        for n in args.n:
+            row = compare_batch(args.seed, n, args.density, args.noise, args.queries, args.sources, args.workers)
+            results.append(row)
+            rates = ', '.join(f'{count} workers {row[f"{count}_workers_qps"]:.1f}' for count in args.workers)
+            print(f'n={n}: loop {row["loop_qps"]:.1f}, {rates} queries/sec')
+
+    if args.command == 'sweep':
+        results = run_sweep(args.n, args.density, args.noise, args.finder, args.queries, args.trials, args.seed)
+        for row in results:
+            print(f'n={row["size"]} density={row["density"]} noise={row["noise"]} '
+                  f'(generated in {round(row["generate_time"], 4)} sec) {row["finder"]:>14}: '
+                  f'{round(row["median_time"], 4)} sec, peak {row["peak_memory"] / 1e6:.2f} MB, '
+                  f'settled {row["n_nodes_settled"]}')
+
+    write_results(results, args.json, getattr(args, 'csv', None))
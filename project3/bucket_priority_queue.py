@@ -0,0 +1,69 @@
+import math
+
+
+class DialPriorityQueue:
+    """
+    Dial's bucket queue: node distances are quantized into buckets `bucket_width` wide.
+
+    pop_min() scans only the lowest non-empty bucket, so it still returns the exact minimum,
+    and the cursor over buckets only moves forward while keys are monotone (as in Dijkstra).
+    Long runs of empty buckets (heavy edges) are jumped over rather than stepped through.
+    """
+
+    def __init__(self, bucket_width: float = 0.01):
+        if bucket_width <= 0:
+            raise ValueError('bucket_width must be positive')
+        self.bucket_width = bucket_width
+        self.buckets: dict[int, dict[int, float]] = {}
+        self.bucket_of: dict[int, int] = {}
+        self.cursor = 0  # no non-empty bucket is below this one
+
+    def make(self, graph):
+        return
+
+    def _bucket(self, distance: float) -> int:
+        if math.isinf(distance):
+            raise ValueError('DialPriorityQueue cannot hold infinite distances')
+        return int(distance // self.bucket_width)
+
+    def push(self, distance: float, node: int):
+        self.update(distance, node)
+
+    def update(self, new_distance: float, node: int):
+        old = self.bucket_of.get(node)
+        if old is not None:
+            del self.buckets[old][node]
+            if not self.buckets[old]:
+                del self.buckets[old]
+
+        index = self._bucket(new_distance)
+        self.buckets.setdefault(index, {})[node] = new_distance
+        self.bucket_of[node] = index
+        if index < self.cursor:
+            self.cursor = index
+
+    def pop_min(self) -> tuple[float, int]:
+        if self.is_empty():
+            raise IndexError('Trying to pop from an empty queue')
+
+        # Step over empty buckets while that is cheaper than looking at every non-empty one;
+        # past that, jump straight to the lowest. Either way a pop costs at most the number of
+        # non-empty buckets, which Dijkstra keeps within (largest weight / bucket_width) + 1.
+        steps = len(self.buckets)
+        while self.cursor not in self.buckets:
+            steps -= 1
+            if steps < 0:
+                self.cursor = min(self.buckets)
+                break
+            self.cursor += 1
+        bucket = self.buckets[self.cursor]
+
+        min_node, min_distance = min(bucket.items(), key=lambda item: item[1])
+        del bucket[min_node]
+        if not bucket:
+            del self.buckets[self.cursor]
+        del self.bucket_of[min_node]
+        return min_distance, min_node
+
+    def is_empty(self) -> bool:
+        return len(self.bucket_of) == 0
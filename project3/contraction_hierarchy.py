@@ -0,0 +1,270 @@
+import heapq
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+INFINITY = float('inf')
+
+# Settled nodes after which a witness search gives up (and a shortcut is added, to be safe)
+WITNESS_LIMIT = 200
+
+# Contraction stops, leaving the remaining nodes as an uncontracted core, once the remaining graph
+# averages more than CORE_DEGREE edges out of each node, or there are more than SHORTCUT_RATIO
+# shortcuts per original edge. Past that point each contraction adds more shortcuts than it
+# removes edges, and the witness searches (and the build time) grow out of control.
+CORE_DEGREE = 8
+SHORTCUT_RATIO = 1.0
+
+
+def _witness_distances(out_edges: dict[int, dict[int, float]], source: int, skip: int,
+                       targets: set[int], limit: float) -> dict[int, float]:
+    """
+    Dijkstra from `source` in the remaining graph without `skip`,
+    stopping past `limit`, once every target is settled, or after WITNESS_LIMIT nodes.
+    """
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    remaining = set(targets)
+    while heap and remaining and settled < WITNESS_LIMIT:
+        distance, node = heapq.heappop(heap)
+        if distance > dist[node]:
+            continue
+        if distance > limit:
+            break
+        settled += 1
+        remaining.discard(node)
+        for neighbor, weight in out_edges[node].items():
+            new_distance = distance + weight
+            if neighbor != skip and new_distance < dist.get(neighbor, INFINITY):
+                dist[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))
+    return dist
+
+
+class ContractionHierarchy:
+    """
+    A graph preprocessed for fast point-to-point queries.
+
+    Nodes are contracted one at a time, least important first. Contracting v removes it
+    and adds a shortcut u -> w (remembering v as its middle node) for every path u -> v -> w
+    that has no equally short witness path around v. Every path can then be found by
+    a bidirectional search that only climbs to more important nodes.
+
+    Once the remaining graph gets too dense (see CORE_DEGREE and SHORTCUT_RATIO), the nodes
+    left over form a core that is not contracted: they rank above everything else and keep
+    all their edges among themselves, so the search runs as plain bidirectional Dijkstra there.
+
+    `up[u]` holds the edges u -> v to higher-ranked nodes, and `down[v]` holds
+    the edges u -> v from higher-ranked nodes u, keyed by u (the backward search walks them).
+    `middle[(u, v)]` is the contracted node a shortcut u -> v skips over.
+    """
+
+    def __init__(self, rank: list[int], up: dict[int, dict[int, float]],
+                 down: dict[int, dict[int, float]], middle: dict[tuple[int, int], int]):
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.middle = middle
+
+    @classmethod
+    def build(cls, graph: dict[int, dict[int, float]], core_degree: float = CORE_DEGREE,
+              shortcut_ratio: float = SHORTCUT_RATIO) -> 'ContractionHierarchy':
+        out_edges = {node: dict(edges) for node, edges in graph.items()}
+        in_edges: dict[int, dict[int, float]] = {node: {} for node in graph}
+        for node, edges in graph.items():
+            for neighbor, weight in edges.items():
+                if neighbor != node:
+                    in_edges[neighbor][node] = weight
+        for node in out_edges:
+            out_edges[node].pop(node, None)
+
+        contracted_neighbors = {node: 0 for node in graph}
+        n_edges = sum(len(edges) for edges in out_edges.values())
+        max_shortcuts = shortcut_ratio * n_edges
+
+        def shortcuts(node: int) -> list[tuple[int, int, float]]:
+            needed = []
+            targets = set(out_edges[node])
+            for u, to_node in in_edges[node].items():
+                limit = to_node + max((w for t, w in out_edges[node].items() if t != u), default=-1)
+                if limit < 0:
+                    continue
+                dist = _witness_distances(out_edges, u, node, targets - {u}, limit)
+                for w, from_node in out_edges[node].items():
+                    cost = to_node + from_node
+                    if w != u and dist.get(w, INFINITY) > cost:
+                        needed.append((u, w, cost))
+            return needed
+
+        def priority(node: int, needed: list[tuple[int, int, float]]) -> int:
+            # Edge difference, plus a term that spreads contraction evenly over the graph
+            removed = len(in_edges[node]) + len(out_edges[node])
+            return len(needed) - removed + contracted_neighbors[node]
+
+        heap = [(priority(node, shortcuts(node)), node) for node in graph]
+        heapq.heapify(heap)
+        rank = [0] * len(graph)
+        up: dict[int, dict[int, float]] = {}
+        down: dict[int, dict[int, float]] = {}
+        middle: dict[tuple[int, int], int] = {}
+        order = 0
+        while heap:
+            _, node = heapq.heappop(heap)
+            # Lazy update: the priority may be stale, so only contract if it is still the smallest
+            needed = shortcuts(node)
+            current = priority(node, needed)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, node))
+                continue
+
+            if n_edges > core_degree * len(out_edges) or len(middle) > max_shortcuts:
+                # Too dense to keep contracting: what is left becomes the core
+                for core_node in list(out_edges):
+                    rank[core_node] = order
+                    order += 1
+                    up[core_node] = out_edges.pop(core_node)
+                    down[core_node] = in_edges.pop(core_node)
+                break
+
+            for u, w, cost in needed:
+                if cost < out_edges[u].get(w, INFINITY):
+                    n_edges += w not in out_edges[u]
+                    out_edges[u][w] = cost
+                    in_edges[w][u] = cost
+                    middle[(u, w)] = node
+
+            rank[node] = order
+            order += 1
+            up[node] = out_edges.pop(node)
+            down[node] = in_edges.pop(node)
+            n_edges -= len(up[node]) + len(down[node])
+            for w in up[node]:
+                del in_edges[w][node]
+                contracted_neighbors[w] += 1
+            for u in down[node]:
+                del out_edges[u][node]
+                contracted_neighbors[u] += 1
+
+        return cls(rank, up, down, middle)
+
+    def shortest_path(self, source: int, target: int) -> tuple[list[int], float]:
+        """
+        Find the shortest (least-cost) path from `source` to `target`.
+
+        Return:
+            - the list of nodes (including `source` and `target`)
+            - the cost of the path
+        """
+        meeting, forward_pred, backward_pred = self._search(source, target)
+        if meeting is None:
+            return [], INFINITY
+
+        # Path in the hierarchy, shortcuts and all
+        hops = [meeting]
+        while forward_pred[hops[-1]] is not None:
+            hops.append(forward_pred[hops[-1]])
+        hops.reverse()
+        while backward_pred[hops[-1]] is not None:
+            hops.append(backward_pred[hops[-1]])
+
+        path = [source]
+        for a, b in zip(hops, hops[1:]):
+            path.extend(self._unpack(a, b))
+
+        # Summed edge by edge along the path so the cost matches Dijkstra's to the last bit
+        cost = 0
+        for a, b in zip(path, path[1:]):
+            cost += self._weight(a, b)
+        return path, cost
+
+    def _search(self, source: int, target: int) -> tuple[int | None, dict[int, int], dict[int, int]]:
+        # Bidirectional Dijkstra where each side only follows edges up the hierarchy
+        dist = ({source: 0}, {target: 0})
+        pred = ({source: None}, {target: None})
+        heaps = ([(0, source)], [(0, target)])
+        graphs = (self.up, self.down)
+        best = INFINITY if source != target else 0
+        meeting = source if source == target else None
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                heap = heaps[side]
+                if not heap:
+                    continue
+                distance, node = heapq.heappop(heap)
+                if distance >= best:
+                    # Nothing on this side can improve the best path any more
+                    heap.clear()
+                    continue
+                if distance > dist[side][node]:
+                    continue
+
+                other = dist[1 - side].get(node)
+                if other is not None and distance + other < best:
+                    best = distance + other
+                    meeting = node
+
+                for neighbor, weight in graphs[side][node].items():
+                    new_distance = distance + weight
+                    if new_distance < dist[side].get(neighbor, INFINITY):
+                        dist[side][neighbor] = new_distance
+                        pred[side][neighbor] = node
+                        heapq.heappush(heap, (new_distance, neighbor))
+
+        return meeting, pred[0], pred[1]
+
+    def _unpack(self, a: int, b: int) -> list[int]:
+        # The original nodes after `a` up to and including `b`
+        nodes = []
+        stack = [(a, b)]
+        while stack:
+            u, w = stack.pop()
+            v = self.middle.get((u, w))
+            if v is None:
+                nodes.append(w)
+            else:
+                stack.append((v, w))
+                stack.append((u, v))
+        return nodes
+
+    def _weight(self, u: int, w: int) -> float:
+        if self.rank[w] > self.rank[u]:
+            return self.up[u][w]
+        return self.down[w][u]
+
+    @property
+    def num_shortcuts(self) -> int:
+        return len(self.middle)
+
+    def save(self, path: str):
+        """
+        Write the hierarchy to an .npz file (see load).
+        """
+        arrays = {'rank': np.array(self.rank, dtype=np.int32)}
+        for name, graph in (('up', self.up), ('down', self.down)):
+            csr = CSRGraph.from_dict(graph)
+            middles = [
+                self.middle.get((u, w) if name == 'up' else (w, u), -1)
+                for u in range(csr.num_nodes) for w in graph[u]
+            ]
+            arrays[f'{name}_indptr'] = csr.indptr
+            arrays[f'{name}_indices'] = csr.indices
+            arrays[f'{name}_weights'] = csr.weights
+            arrays[f'{name}_middle'] = np.array(middles, dtype=np.int32)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'ContractionHierarchy':
+        with np.load(path) as arrays:
+            graphs = {}
+            middle = {}
+            for name in ('up', 'down'):
+                csr = CSRGraph(arrays[f'{name}_indptr'], arrays[f'{name}_indices'], arrays[f'{name}_weights'])
+                graphs[name] = csr.to_dict()
+                sources = np.repeat(np.arange(csr.num_nodes), np.diff(csr.indptr)).tolist()
+                for u, w, v in zip(sources, csr.indices.tolist(), arrays[f'{name}_middle'].tolist()):
+                    if v != -1:
+                        middle[(u, w) if name == 'up' else (w, u)] = v
+            return cls(arrays['rank'].tolist(), graphs['up'], graphs['down'], middle)
@@ -0,0 +1,76 @@
+from itertools import chain
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    A directed, weighted graph in compressed sparse row form.
+
+    The edges leaving node u are `indices[indptr[u]:indptr[u + 1]]`,
+    with matching costs in `weights`. Nodes are the integers 0..n-1.
+    Iterating over the graph yields its nodes, like iterating over the dict form.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray):
+        if len(indptr) == 0 or indptr[0] != 0 or indptr[-1] != len(indices) or len(indices) != len(weights):
+            raise ValueError('indptr must run from 0 to the number of edges, with one weight per edge')
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    @classmethod
+    def from_dict(cls, graph: dict[int, dict[int, float]]) -> 'CSRGraph':
+        n = len(graph)
+        if any(node not in graph for node in range(n)):
+            raise ValueError('CSRGraph needs the nodes to be numbered 0..n-1')
+
+        degrees = np.fromiter((len(graph[node]) for node in range(n)), dtype=np.int64, count=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        m = int(indptr[-1])
+
+        indices = np.fromiter(chain.from_iterable(graph[node].keys() for node in range(n)), dtype=np.int32, count=m)
+        weights = np.fromiter(chain.from_iterable(graph[node].values() for node in range(n)), dtype=np.float64, count=m)
+        return cls(indptr, indices, weights)
+
+    def to_dict(self) -> dict[int, dict[int, float]]:
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        weights = self.weights.tolist()
+        return {
+            node: dict(zip(indices[indptr[node]:indptr[node + 1]], weights[indptr[node]:indptr[node + 1]]))
+            for node in range(self.num_nodes)
+        }
+
+    def reverse(self) -> 'CSRGraph':
+        """
+        The same graph with every edge pointing the other way.
+        """
+        sources = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.num_nodes), out=indptr[1:])
+        return CSRGraph(indptr, sources[order], self.weights[order])
+
+    def neighbors(self, node: int) -> tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def __iter__(self):
+        return iter(range(self.num_nodes))
@@ -0,0 +1,111 @@
+INFINITY = float('inf')
+
+
+class DaryHeapPriorityQueue:
+    """
+    Indexed d-ary min-heap with the same interface as HeapPriorityQueue.
+
+    Differences from HeapPriorityQueue:
+        - each node has `arity` children, so the heap is shallower and decrease-key
+          (sift up) takes fewer steps, at the price of more comparisons per sift down
+        - a node's heap position is kept in a list indexed by node id instead of a dict,
+          so node ids must be small non-negative integers (as they are in generate_graph)
+        - sifts are loops that move a hole instead of swapping at every level
+        - make() only sizes the position list; nodes enter the heap the first time
+          they are pushed or updated, instead of all starting at infinity
+    """
+
+    def __init__(self, arity: int = 4):
+        if arity < 2:
+            raise ValueError('A heap needs an arity of at least 2')
+        self.arity = arity
+        self.distances: list[float] = []
+        self.nodes: list[int] = []
+        self.positions: list[int] = []  # -1 when the node is not in the heap
+
+    def make(self, graph):
+        self.positions = [-1] * (max(graph, default=-1) + 1)
+
+    def push(self, distance: float, node: int):
+        if node >= len(self.positions):
+            self.positions.extend([-1] * (node + 1 - len(self.positions)))
+        self.distances.append(distance)
+        self.nodes.append(node)
+        self._sift_up(len(self.nodes) - 1, distance, node)
+
+    def update(self, new_distance: float, node: int):
+        index = self.positions[node] if node < len(self.positions) else -1
+        if index == -1:
+            self.push(new_distance, node)
+        elif new_distance < self.distances[index]:
+            self._sift_up(index, new_distance, node)
+        else:
+            self._sift_down(index, new_distance, node)
+
+    def pop_min(self) -> tuple[float, int]:
+        if not self.nodes:
+            raise IndexError('Trying to pop from an empty queue')
+
+        min_distance = self.distances[0]
+        min_node = self.nodes[0]
+        self.positions[min_node] = -1
+
+        last_distance = self.distances.pop()
+        last_node = self.nodes.pop()
+        if self.nodes:
+            self._sift_down(0, last_distance, last_node)
+
+        return min_distance, min_node
+
+    def _sift_up(self, index: int, distance: float, node: int):
+        # Move parents down into the hole until `distance` fits, then drop it in
+        distances = self.distances
+        nodes = self.nodes
+        positions = self.positions
+        arity = self.arity
+        while index > 0:
+            parent = (index - 1) // arity
+            parent_distance = distances[parent]
+            if parent_distance <= distance:
+                break
+            distances[index] = parent_distance
+            nodes[index] = nodes[parent]
+            positions[nodes[index]] = index
+            index = parent
+        distances[index] = distance
+        nodes[index] = node
+        positions[node] = index
+
+    def _sift_down(self, index: int, distance: float, node: int):
+        # Move the smallest child up into the hole until `distance` fits, then drop it in
+        distances = self.distances
+        nodes = self.nodes
+        positions = self.positions
+        arity = self.arity
+        size = len(distances)
+        while True:
+            first_child = arity * index + 1
+            if first_child >= size:
+                break
+            last_child = min(first_child + arity, size)
+            smallest = first_child
+            smallest_distance = distances[first_child]
+            for child in range(first_child + 1, last_child):
+                if distances[child] < smallest_distance:
+                    smallest = child
+                    smallest_distance = distances[child]
+            if smallest_distance >= distance:
+                break
+            distances[index] = smallest_distance
+            nodes[index] = nodes[smallest]
+            positions[nodes[index]] = index
+            index = smallest
+        distances[index] = distance
+        nodes[index] = node
+        positions[node] = index
+
+    def size(self) -> int:
+        return len(self.distances)
+
+    def is_empty(self) -> bool:
+        return self.size() == 0
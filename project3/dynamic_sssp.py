@@ -0,0 +1,140 @@
+import heapq
+
+from shortest_path_tree import find_shortest_path_tree
+
+INFINITY = float('inf')
+
+
+class DynamicShortestPaths:
+    """
+    A shortest-path tree from `source` that is repaired, not recomputed, when an edge changes
+    (in the style of Ramalingam and Reps).
+
+    - A cheaper (or new) edge u -> v only matters if it shortens the path to v; if it does,
+      the improvement spreads outward from v with Dijkstra, stopping wherever it no longer helps.
+    - A dearer (or removed) edge only matters if it is in the tree; then exactly the subtree
+      under it is affected. Each affected node restarts from its best edge coming from outside
+      the subtree, and Dijkstra settles the subtree again.
+
+    `graph` is updated in place. Nodes must be numbered 0..n-1.
+    """
+
+    def __init__(self, graph: dict[int, dict[int, float]], source: int):
+        self.graph = graph
+        self.source = source
+        self.incoming: dict[int, dict[int, float]] = {node: {} for node in graph}
+        for node, edges in graph.items():
+            for neighbor, weight in edges.items():
+                self.incoming[neighbor][node] = weight
+
+        self.dist, self.predecessor = find_shortest_path_tree(graph, source)
+        self.children: list[set[int]] = [set() for _ in graph]
+        for node, parent in enumerate(self.predecessor):
+            if parent != -1:
+                self.children[parent].add(node)
+
+    def update_edge(self, u: int, v: int, weight: float) -> int:
+        """
+        Set the weight of edge u -> v, adding it if needed; infinity removes it.
+
+        Return how many nodes had to be revisited.
+        """
+        old = self.graph[u].get(v, INFINITY)
+        if weight == INFINITY:
+            self.graph[u].pop(v, None)
+            self.incoming[v].pop(u, None)
+        else:
+            self.graph[u][v] = weight
+            self.incoming[v][u] = weight
+
+        if weight < old:
+            return self._decrease(u, v)
+        if weight > old and self.predecessor[v] == u:
+            return self._increase(v)
+        return 0
+
+    def remove_edge(self, u: int, v: int) -> int:
+        return self.update_edge(u, v, INFINITY)
+
+    def _set_parent(self, node: int, parent: int):
+        old = self.predecessor[node]
+        if old != -1:
+            self.children[old].discard(node)
+        self.predecessor[node] = parent
+        if parent != -1:
+            self.children[parent].add(node)
+
+    def _propagate(self, queue: list[tuple[float, int]], allowed: set[int] | None = None) -> int:
+        # Dijkstra from the nodes in `queue` (already holding their new distances),
+        # relaxing only into `allowed` nodes if given
+        dist = self.dist
+        visited = 0
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > dist[node]:
+                continue
+            visited += 1
+            for neighbor, weight in self.graph[node].items():
+                if allowed is not None and neighbor not in allowed:
+                    continue
+                new_distance = distance + weight
+                if new_distance < dist[neighbor]:
+                    dist[neighbor] = new_distance
+                    self._set_parent(neighbor, node)
+                    heapq.heappush(queue, (new_distance, neighbor))
+        return visited
+
+    def _decrease(self, u: int, v: int) -> int:
+        new_distance = self.dist[u] + self.graph[u][v]
+        if new_distance >= self.dist[v]:
+            return 0
+        self.dist[v] = new_distance
+        self._set_parent(v, u)
+        return self._propagate([(new_distance, v)])
+
+    def _increase(self, v: int) -> int:
+        # Everything under v in the tree may now be farther away; nothing else is
+        affected = set()
+        stack = [v]
+        while stack:
+            node = stack.pop()
+            affected.add(node)
+            stack.extend(self.children[node])
+
+        for node in affected:
+            self.dist[node] = INFINITY
+
+        # Best way into the subtree from outside it
+        queue = []
+        for node in affected:
+            best, parent = INFINITY, -1
+            for neighbor, weight in self.incoming[node].items():
+                if neighbor not in affected and self.dist[neighbor] + weight < best:
+                    best, parent = self.dist[neighbor] + weight, neighbor
+            self.dist[node] = best
+            self._set_parent(node, parent)
+            if best < INFINITY:
+                queue.append((best, node))
+
+        heapq.heapify(queue)
+        self._propagate(queue, affected)
+        return len(affected)
+
+    def path_to(self, target: int) -> tuple[list[int], float]:
+        """
+        Return:
+            - the list of nodes (including the source and `target`)
+            - the cost of the path
+        """
+        if self.dist[target] == INFINITY:
+            return [], INFINITY
+
+        path_to_target: list[int] = []
+        next_node = target
+        while next_node != -1:
+            path_to_target.append(next_node)
+            next_node = self.predecessor[next_node]
+
+        path_to_target.reverse()
+
+        return path_to_target, self.dist[target]
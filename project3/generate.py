@@ -0,0 +1,154 @@
+import math
+import random
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+
+def rand1to1():
+    return (random.random() - 0.5) * 2  # -1 to 1
+
+
+def dist(p1, p2, noise):
+    if noise == -1:
+        return random.random()
+
+    raw_dist = math.dist(p1, p2)
+
+    return max(0.0, raw_dist + random.normalvariate(mu=0, sigma=noise))
+
+
+def generate_graph(seed, size, density, noise) -> tuple[
+    list[tuple[float, float]],   # The positions
+    dict[int, dict[int, float]]  # The graph
+]:
+    random.seed(seed)
+
+    positions = [
+        (rand1to1(), rand1to1())
+        for _ in range(size)
+    ]
+
+    edges_per_node = int(round((size - 1) * density))
+
+    weights = {}
+    for source in range(size):
+        weights[source] = {}
+        for target in random.sample(range(size), edges_per_node):
+            weights[source][target] = dist(positions[source], positions[target], noise)
+
+    return positions, weights
+
+
+# generate_graph_csr draws each block of this many source nodes from its own seed,
+# so the graph it builds doesn't depend on how it is chunked
+GENERATOR_BLOCK = 1024
+
+
+def _edge_count(size: int, density: float) -> int:
+    return int(round((size - 1) * density))
+
+
+def _sample_targets(rng: np.random.Generator, rows: int, size: int, k: int) -> np.ndarray:
+    """
+    `rows` independent samples of `k` distinct nodes out of `size`, each sorted.
+    """
+    if k == 0:
+        return np.zeros((rows, 0), dtype=np.int32)
+
+    if 2 * k > size:
+        # Dense: keep the k smallest of `size` random keys, a few rows at a time to bound memory
+        step = max(1, 2 ** 22 // size)
+        samples = []
+        for first in range(0, rows, step):
+            keys = rng.random((min(step, rows - first), size))
+            samples.append(np.argpartition(keys, k - 1, axis=1)[:, :k])
+        targets = np.concatenate(samples).astype(np.int32)
+        targets.sort(axis=1)
+        return targets
+
+    # Sparse: draw with replacement, then redraw repeats until every row is distinct
+    targets = rng.integers(0, size, (rows, k), dtype=np.int32)
+    while True:
+        targets.sort(axis=1)
+        repeats = targets[:, 1:] == targets[:, :-1]
+        n_repeats = np.count_nonzero(repeats)
+        if n_repeats == 0:
+            return targets
+        targets[:, 1:][repeats] = rng.integers(0, size, n_repeats, dtype=np.int32)
+
+
+def _block_edges(seed: int, block: int, positions: np.ndarray, first: int, last: int,
+                 k: int, noise: float) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1, block)))
+    targets = _sample_targets(rng, last - first, len(positions), k).reshape(-1)
+    sources = np.repeat(np.arange(first, last), k)
+
+    if noise == -1:
+        weights = rng.random(len(targets))
+    else:
+        raw_dist = np.hypot(*(positions[targets] - positions[sources]).T)
+        weights = np.maximum(0.0, raw_dist + rng.normal(0, noise, len(targets)))
+
+    return targets, weights
+
+
+def generate_graph_chunks(seed, size, density, noise, chunk_size: int = 16 * GENERATOR_BLOCK):
+    """
+    Build the same graph as generate_graph_csr, `chunk_size` source nodes at a time.
+
+    Yield the positions first, then one (first_node, last_node, indices, weights) tuple per chunk,
+    where indices and weights hold the edges of nodes first_node..last_node - 1 in CSR order.
+    """
+    seed = np.random.SeedSequence(seed).entropy
+    chunk_size = max(GENERATOR_BLOCK, chunk_size // GENERATOR_BLOCK * GENERATOR_BLOCK)
+
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+    positions = rng.uniform(-1, 1, (size, 2))
+    yield positions
+
+    k = _edge_count(size, density)
+    for first in range(0, size, chunk_size):
+        last = min(first + chunk_size, size)
+        pieces = [
+            _block_edges(seed, block_first // GENERATOR_BLOCK, positions,
+                         block_first, min(block_first + GENERATOR_BLOCK, last), k, noise)
+            for block_first in range(first, last, GENERATOR_BLOCK)
+        ]
+        yield first, last, np.concatenate([p[0] for p in pieces]), np.concatenate([p[1] for p in pieces])
+
+
+def generate_graph_csr(seed, size, density, noise, chunk_size: int = 16 * GENERATOR_BLOCK,
+                       out: tuple[np.ndarray, np.ndarray] | None = None) -> tuple[np.ndarray, CSRGraph]:
+    """
+    Vectorized counterpart of generate_graph that builds a CSRGraph without any dicts.
+
+    Every node gets round((size - 1) * density) distinct targets (possibly including itself),
+    weighted by Euclidean distance plus normal(0, noise) noise, clipped at 0, or uniform
+    random weights when noise is -1, just like generate_graph.
+
+    Seed contract: the result depends only on (seed, size, density, noise), never on
+    `chunk_size`, and is reproducible across runs and platforms for a given numpy version.
+    It is *not* the same graph generate_graph draws for the same seed; that one uses the
+    `random` module and stays available for the tests that pin its exact output.
+    With seed None a fresh random seed is used.
+
+    `out` may supply (indices, weights) arrays of length size * k to fill, such as
+    np.memmap arrays for graphs too big to keep in memory.
+    """
+    k = _edge_count(size, density)
+    if out is None:
+        indices = np.empty(size * k, dtype=np.int32)
+        weights = np.empty(size * k, dtype=np.float64)
+    else:
+        indices, weights = out
+
+    chunks = generate_graph_chunks(seed, size, density, noise, chunk_size)
+    positions = next(chunks)
+    for first, last, chunk_indices, chunk_weights in chunks:
+        indices[first * k:last * k] = chunk_indices
+        weights[first * k:last * k] = chunk_weights
+
+    indptr = np.arange(size + 1, dtype=np.int64) * k
+    return positions, CSRGraph(indptr, indices, weights)
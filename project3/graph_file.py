@@ -0,0 +1,114 @@
+import struct
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from generate import _edge_count, generate_graph_chunks
+
+# File layout, all little-endian:
+#   header   magic, format version, flags, padding (uint32 each), nodes, edges (uint64 each)
+#   indptr   int64   nodes + 1
+#   indices  int32   edges
+#   weights  float32 edges
+#   positions float32 nodes x 2, only if flags has HAS_POSITIONS
+# int64 offsets keep graphs past 2**31 edges addressable; everything else is 32-bit.
+MAGIC = b'CSRG'
+FORMAT_VERSION = 1
+HAS_POSITIONS = 1
+HEADER = struct.Struct('<4sIIIQQ')
+
+INDPTR_DTYPE = np.dtype('<i8')
+INDEX_DTYPE = np.dtype('<i4')
+WEIGHT_DTYPE = np.dtype('<f4')
+POSITION_DTYPE = np.dtype('<f4')
+
+
+def _offsets(n: int, m: int) -> tuple[int, int, int, int, int]:
+    # Byte offsets of indptr, indices, weights and positions, and the file size without positions
+    indptr = HEADER.size
+    indices = indptr + (n + 1) * INDPTR_DTYPE.itemsize
+    weights = indices + m * INDEX_DTYPE.itemsize
+    positions = weights + m * WEIGHT_DTYPE.itemsize
+    return indptr, indices, weights, positions, positions + n * 2 * POSITION_DTYPE.itemsize
+
+
+def save_graph(path: str, graph: CSRGraph, positions=None):
+    """
+    Write `graph` (and optionally the node positions) in the binary graph format.
+    Weights are stored as float32.
+    """
+    n, m = graph.num_nodes, graph.num_edges
+    flags = HAS_POSITIONS if positions is not None else 0
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, 0, n, m))
+        file.write(np.ascontiguousarray(graph.indptr, dtype=INDPTR_DTYPE).tobytes())
+        file.write(np.ascontiguousarray(graph.indices, dtype=INDEX_DTYPE).tobytes())
+        file.write(np.ascontiguousarray(graph.weights, dtype=WEIGHT_DTYPE).tobytes())
+        if positions is not None:
+            file.write(np.ascontiguousarray(positions, dtype=POSITION_DTYPE).reshape(n, 2).tobytes())
+
+
+def save_generated_graph(path: str, seed, size: int, density: float, noise: float,
+                         chunk_size: int | None = None):
+    """
+    Write the graph generate_graph_csr would build straight to `path`, one chunk at a time,
+    so it never has to fit in memory.
+    """
+    k = _edge_count(size, density)
+    n, m = size, size * k
+    indptr_at, indices_at, weights_at, positions_at, end = _offsets(n, m)
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, HAS_POSITIONS, 0, n, m))
+        file.truncate(end)
+
+    file_map = np.memmap(path, dtype=np.uint8, mode='r+')
+    try:
+        indptr = np.ndarray((n + 1,), INDPTR_DTYPE, file_map, indptr_at)
+        indices = np.ndarray((m,), INDEX_DTYPE, file_map, indices_at)
+        weights = np.ndarray((m,), WEIGHT_DTYPE, file_map, weights_at)
+        indptr[:] = np.arange(n + 1, dtype=np.int64) * k
+
+        kwargs = {} if chunk_size is None else {'chunk_size': chunk_size}
+        chunks = generate_graph_chunks(seed, size, density, noise, **kwargs)
+        np.ndarray((n, 2), POSITION_DTYPE, file_map, positions_at)[:] = next(chunks)
+        for first, last, chunk_indices, chunk_weights in chunks:
+            indices[first * k:last * k] = chunk_indices
+            weights[first * k:last * k] = chunk_weights
+        file_map.flush()
+    finally:
+        del file_map
+
+
+def load_graph(path: str) -> tuple[np.ndarray | None, CSRGraph]:
+    """
+    Memory-map a graph written by save_graph or save_generated_graph.
+
+    Nothing is read up front: the arrays are read-only views of the file, paged in
+    as searches touch them, and processes that load the same file share those pages.
+
+    Return the positions (None if the file has none) and the graph.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f'{path} is too short to be a graph file')
+    magic, version, flags, _, n, m = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a graph file')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'{path} has format version {version}, expected {FORMAT_VERSION}')
+
+    indptr_at, indices_at, weights_at, positions_at, end = _offsets(n, m)
+    has_positions = bool(flags & HAS_POSITIONS)
+    file_map = np.memmap(path, dtype=np.uint8, mode='r')
+    if len(file_map) != (end if has_positions else positions_at):
+        raise ValueError(f'{path} is truncated or has trailing data')
+
+    graph = CSRGraph(
+        np.ndarray((n + 1,), INDPTR_DTYPE, file_map, indptr_at),
+        np.ndarray((m,), INDEX_DTYPE, file_map, indices_at),
+        np.ndarray((m,), WEIGHT_DTYPE, file_map, weights_at),
+    )
+    positions = np.ndarray((n, 2), POSITION_DTYPE, file_map, positions_at) if has_positions else None
+    return positions, graph
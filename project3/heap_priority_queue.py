@@ -1,3 +1,5 @@
+from search_stats import SearchStats
+
 INFINITY = float('inf')
 
 class HeapPriorityQueue:
@@ -111,3 +113,44 @@ class HeapPriorityQueue:
     
     def is_empty(self) -> bool:
         return self.size() == 0
+
+
+class InstrumentedHeapPriorityQueue(HeapPriorityQueue):
+    """
+    HeapPriorityQueue that counts its swaps and its largest size into `stats`.
+    Kept separate so the plain queue pays nothing for the counting.
+
+    The size counts live entries only: make() fills the queue with every node at infinity,
+    and those placeholders are not counted until a node is given a distance.
+    """
+
+    def __init__(self, stats: SearchStats):
+        super().__init__()
+        self.stats = stats
+        self.live = 0
+
+    def _grew(self):
+        self.live += 1
+        self.stats.max_queue_size = max(self.stats.max_queue_size, self.live)
+
+    def push(self, distance: float, node: int):
+        super().push(distance, node)
+        if distance < INFINITY:
+            self._grew()
+
+    def update(self, new_distance: float, node: int):
+        index = self.indexes.get(node)
+        was_placeholder = index is not None and self.distances[index] == INFINITY
+        super().update(new_distance, node)
+        if was_placeholder and new_distance < INFINITY:
+            self._grew()
+
+    def pop_min(self) -> tuple[float, int]:
+        distance, node = super().pop_min()
+        if distance < INFINITY:
+            self.live -= 1
+        return distance, node
+
+    def swap(self, index1: int, index2: int):
+        self.stats.n_sift_steps += 1
+        super().swap(index1, index2)
@@ -0,0 +1,102 @@
+import random
+from typing import Callable
+
+import numpy as np
+
+from network_routing import INFINITY, find_shortest_path_with_heuristic, reverse_graph
+from search_stats import SearchStats
+from shortest_path_tree import find_shortest_path_tree
+
+
+def _distances_from(graph: dict[int, dict[int, float]], source: int) -> np.ndarray:
+    return np.array(find_shortest_path_tree(graph, source)[0])
+
+
+class Landmarks:
+    """
+    Distances to and from a few landmark nodes, for ALT (A*, landmarks, triangle inequality).
+
+    For any landmark L, the triangle inequality gives two lower bounds on d(v, t):
+        d(L, t) - d(L, v)   and   d(v, L) - d(t, L)
+    The largest of these over all landmarks is an admissible and consistent A* heuristic
+    whatever the edge weights are, so unlike the straight-line distance it stays valid
+    on noisy, non-euclidean graphs.
+
+    `forward[i]` holds d(landmarks[i], v) and `backward[i]` holds d(v, landmarks[i]) for every node v.
+    """
+
+    def __init__(self, landmarks: list[int], forward: np.ndarray, backward: np.ndarray):
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        # One row per node, so a node's distances to and from every landmark sit together
+        self._forward_by_node = np.ascontiguousarray(forward.T)
+        self._backward_by_node = np.ascontiguousarray(backward.T)
+
+    @classmethod
+    def select(cls, graph: dict[int, dict[int, float]], k: int, seed: int = 312) -> 'Landmarks':
+        """
+        Pick `k` landmarks by farthest-point selection: each new landmark is the node
+        farthest (going there and back) from the landmarks so far.
+        The first is the node farthest from a random start.
+        """
+        reverse = reverse_graph(graph)
+        start = random.Random(seed).randrange(len(graph))
+        round_trip = _distances_from(graph, start) + _distances_from(reverse, start)
+
+        landmarks = []
+        forward = []
+        backward = []
+        closest = np.full(len(graph), INFINITY)
+        for _ in range(min(k, len(graph))):
+            # Nodes unreachable from every landmark so far come first
+            candidates = closest if landmarks else round_trip
+            landmark = int(np.argmax(candidates))
+            landmarks.append(landmark)
+            forward.append(_distances_from(graph, landmark))
+            backward.append(_distances_from(reverse, landmark))
+            closest = np.minimum(closest, forward[-1] + backward[-1])
+            closest[landmarks] = -1
+
+        return cls(landmarks, np.array(forward), np.array(backward))
+
+    def heuristic(self, target: int) -> Callable[[int], float]:
+        """
+        The ALT heuristic for `target`, worked out for a node the first time the search asks for it.
+        A node that provably cannot reach `target` gets infinity.
+        """
+        to_target = self._forward_by_node[target].tolist()
+        from_target = self._backward_by_node[target].tolist()
+        bounds: dict[int, float] = {}
+
+        def lower_bound(node: int) -> float:
+            if node in bounds:
+                return bounds[node]
+            bound = 0.0
+            for landmark_to_target, landmark_to_node, node_to_landmark, target_to_landmark in zip(
+                    to_target, self._forward_by_node[node].tolist(),
+                    self._backward_by_node[node].tolist(), from_target):
+                # inf - inf is nan, which never wins: that landmark says nothing about this node
+                bound = max(bound, landmark_to_target - landmark_to_node, node_to_landmark - target_to_landmark)
+            bounds[node] = bound
+            return bound
+
+        return lower_bound
+
+
+def find_shortest_path_alt(
+        graph: dict[int, dict[int, float]],
+        landmarks: Landmarks,
+        source: int,
+        target: int,
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    Find the shortest (least-cost) path from `source` to `target` with A*,
+    guided by the landmark lower bounds (see Landmarks).
+
+    Return:
+        - the list of nodes (including `source` and `target`)
+        - the cost of the path
+    """
+    return find_shortest_path_with_heuristic(graph, source, target, landmarks.heuristic(target), stats)
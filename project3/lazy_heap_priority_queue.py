@@ -0,0 +1,41 @@
+import heapq
+
+
+class LazyHeapPriorityQueue:
+    """
+    Priority queue on top of `heapq` without decrease-key.
+
+    update() pushes a new entry instead of moving the old one; entries whose
+    distance is no longer the node's latest are skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self.heap: list[tuple[float, int]] = []
+        self.distances: dict[int, float] = {}  # latest distance of each queued node
+
+    def make(self, graph):
+        return
+
+    def push(self, distance: float, node: int):
+        self.distances[node] = distance
+        heapq.heappush(self.heap, (distance, node))
+
+    def update(self, new_distance: float, node: int):
+        self.push(new_distance, node)
+
+    def _drop_stale(self):
+        heap = self.heap
+        while heap and self.distances.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def pop_min(self) -> tuple[float, int]:
+        self._drop_stale()
+        if not self.heap:
+            raise IndexError('Trying to pop from an empty queue')
+        distance, node = heapq.heappop(self.heap)
+        del self.distances[node]
+        return distance, node
+
+    def is_empty(self) -> bool:
+        self._drop_stale()
+        return not self.heap
@@ -1,3 +1,5 @@
+from search_stats import SearchStats
+
 INFINITY = float('inf')
 
 class LinearPriorityQueue:
@@ -24,4 +26,32 @@ class LinearPriorityQueue:
         self.distances[node] = new_distance
 
     def is_empty(self) -> bool:
-        return len(self.distances) == 0
\ No newline at end of file
+        return len(self.distances) == 0
+
+
+class InstrumentedLinearPriorityQueue(LinearPriorityQueue):
+    """
+    LinearPriorityQueue that counts the entries pop_min scans and its largest size into `stats`.
+    Like InstrumentedHeapPriorityQueue, the size leaves out the placeholders make() adds at infinity.
+    """
+
+    def __init__(self, stats: SearchStats):
+        super().__init__()
+        self.stats = stats
+        self.live = 0
+
+    def update(self, new_distance: float, node: int):
+        if self.distances.get(node, INFINITY) == INFINITY and new_distance < INFINITY:
+            self.live += 1
+            self.stats.max_queue_size = max(self.stats.max_queue_size, self.live)
+        super().update(new_distance, node)
+
+    def push(self, new_distance: float, node: int):
+        self.update(new_distance, node)
+
+    def pop_min(self) -> tuple[float, int]:
+        self.stats.n_sift_steps += len(self.distances)
+        distance, node = super().pop_min()
+        if distance < INFINITY:
+            self.live -= 1
+        return distance, node
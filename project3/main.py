@@ -1,68 +1,65 @@
 import argparse
 import math
-import random
+import os
 from math import inf
 from time import time
 
 from plotting import plot_points, draw_path, circle_point, title, show_plot, plot_weights
-from network_routing import find_shortest_path_with_array, find_shortest_path_with_heap
-
-
-def rand1to1():
-    return (random.random() - 0.5) * 2  # -1 to 1
-
-
-def dist(p1, p2, noise):
-    if noise == -1:
-        return random.random()
-
-    raw_dist = math.dist(p1, p2)
-
-    return max(0.0, raw_dist + random.normalvariate(mu=0, sigma=noise))
-
-
-def generate_graph(seed, size, density, noise) -> tuple[
-    list[tuple[float, float]],   # The positions
-    dict[int, dict[int, float]]  # The graph
-]:
-    random.seed(seed)
-
-    positions = [
-        (rand1to1(), rand1to1())
-        for _ in range(size)
-    ]
-
-    edges_per_node = int(round((size - 1) * density))
-
-    weights = {}
-    for source in range(size):
-        weights[source] = {}
-        for target in random.sample(range(size), edges_per_node):
-            weights[source][target] = dist(positions[source], positions[target], noise)
-
-    return positions, weights
-
-
-def main(seed: int, size: int, density: float, noise: float, source: int, target: int):
+from network_routing import (find_shortest_path_with_array, find_shortest_path_with_heap,
+                             find_shortest_path_with_array_csr, find_shortest_path_with_heap_csr)
+from generate import generate_graph
+from graph_file import load_graph, save_generated_graph
+from search_stats import SearchStats
+
+
+def print_stats(stats: SearchStats | None):
+    if stats is None:
+        return
+    print(f'Settled: {stats.n_nodes_settled}, relaxed: {stats.n_edges_relaxed}, '
+          f'decrease-keys: {stats.n_decrease_keys}, sift steps: {stats.n_sift_steps}, '
+          f'max queue: {stats.max_queue_size}')
+    print(f'Setup: {round(stats.setup_time, 4)}, search: {round(stats.search_time, 4)}, '
+          f'path: {round(stats.path_time, 4)}')
+
+
+def main(seed: int, size: int, density: float, noise: float, source: int, target: int,
+         graph_file: str | None = None, count: bool = False):
+    find_heap, find_array = find_shortest_path_with_heap, find_shortest_path_with_array
     start = time()
-    positions, weights = generate_graph(seed, size, density, noise)
+    if graph_file is None:
+        positions, weights = generate_graph(seed, size, density, noise)
+    else:
+        # Generate into the file only the first time; later runs just map it
+        if not os.path.exists(graph_file):
+            save_generated_graph(graph_file, seed, size, density, noise)
+        positions, weights = load_graph(graph_file)
+        find_heap, find_array = find_shortest_path_with_heap_csr, find_shortest_path_with_array_csr
     end = time()
 
-    num_edges = sum(len(edges) for edges in weights.values())
+    if graph_file is None:
+        num_edges = sum(len(edges) for edges in weights.values())
+        direct_cost = weights[source].get(target, math.inf)
+    else:
+        num_edges = weights.num_edges
+        size = weights.num_nodes
+        neighbors, costs = weights.neighbors(source)
+        direct_cost = float(costs[neighbors == target][0]) if target in neighbors else math.inf
     print(f'Time to generate network of {size} nodes and {num_edges} edges: {round(end - start, 4)}')
 
-    print(f'Direct cost from {source} to {target}: {weights[source].get(target, math.inf)}')
+    print(f'Direct cost from {source} to {target}: {direct_cost}')
 
     plot_points(positions)
     if num_edges < 50:
         # If the number of non-inf edges is < 50
-        plot_weights(positions, weights)
+        plot_weights(positions, weights if graph_file is None else weights.to_dict())
 
     circle_point(positions[source], c='r')
     circle_point(positions[target], c='b')
 
+    # Counting slows the search down, so the times below include it when --stats is on
+    heap_stats = SearchStats() if count else None
     start = time()
-    path, cost = find_shortest_path_with_heap(weights, source, target)
+    path, cost = find_heap(weights, source, target, stats=heap_stats)
     end = time()
     heap_time = end - start
     print()
@@ -70,11 +67,13 @@ def main(seed: int, size: int, density: float, noise: float, source: int, target
     print('Path:', path)
     print('Cost:', cost)
     print('Time:', heap_time)
+    print_stats(heap_stats)
 
     draw_path(positions, path)
 
+    array_stats = SearchStats() if count else None
     start = time()
-    path, cost = find_shortest_path_with_array(weights, source, target)
+    path, cost = find_array(weights, source, target, stats=array_stats)
     end = time()
     array_time = end - start
     print()
@@ -82,6 +81,7 @@ def main(seed: int, size: int, density: float, noise: float, source: int, target
     print('Path:', path)
     print('Cost:', cost)
     print('Time:', array_time)
+    print_stats(array_stats)
 
     title(f'Cost: {cost}, Heap: {round(heap_time, 4)}, Array: {round(array_time, 4)}')
     show_plot()
@@ -101,6 +101,10 @@ if __name__ == '__main__':
     parser.add_argument('--source', type=int, default=0, help='Starting node')
     parser.add_argument('--target', type=int, default=None, help='Target node')
     parser.add_argument('--debug', action='store_true', help='Turn on debug plotting')
+    parser.add_argument('--stats', action='store_true',
+                        help='Count the work each finder does')
+    parser.add_argument('--graph-file', default=None,
+                        help='Binary graph file to load, generated with the other options if it does not exist')
     args = parser.parse_args()
 
     if args.debug:
@@ -116,8 +120,8 @@ if __name__ == '__main__':
     if args.target is None:
         args.target = args.n - 1
 
-    main(args.seed, args.n, args.density, args.noise, args.source, args.target)
+    main(args.seed, args.n, args.density, args.noise, args.source, args.target, args.graph_file, args.stats)
 
-    # You can use a loop like the following to generate data for your tables:
-    for n, d in zip([50000, 100000],[0.01,0.01]):
-        main(312, n, d, 0.02, 2, 9)
+    # To generate data for your tables, time the finders without plotting
+    # (the CSR finders alone, as dict graphs this large do not fit in memory):
+    #   python benchmark.py sweep -n 50000 100000 --density 0.01 --noise 0.02 --finder heap_csr array_csr
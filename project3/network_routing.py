@@ -1,43 +1,100 @@
-from linear_priority_queue import LinearPriorityQueue
-from heap_priority_queue import HeapPriorityQueue
+from linear_priority_queue import LinearPriorityQueue, InstrumentedLinearPriorityQueue
+from heap_priority_queue import HeapPriorityQueue, InstrumentedHeapPriorityQueue
+from dary_heap_priority_queue import DaryHeapPriorityQueue
+from pairing_heap_priority_queue import PairingHeapPriorityQueue
+from radix_heap_priority_queue import RadixHeapPriorityQueue
+from lazy_heap_priority_queue import LazyHeapPriorityQueue
+from bucket_priority_queue import DialPriorityQueue
+from csr_graph import CSRGraph
+from search_stats import SearchStats
+import heapq
+import math
+from time import perf_counter
+from typing import Callable
 INFINITY = float('inf')
 
-def find_shortest_path_with_heap(
+# Priority-queue strategies for find_shortest_path, by name.
+# Each one has make(graph), update(distance, node) (insert or change), pop_min() and is_empty().
+PRIORITY_QUEUES = {
+    'heap': HeapPriorityQueue,
+    'array': LinearPriorityQueue,
+    'dary': DaryHeapPriorityQueue,
+    'pairing': PairingHeapPriorityQueue,
+    'radix': RadixHeapPriorityQueue,  # keys must be monotone and non-negative
+    'lazy_heap': LazyHeapPriorityQueue,
+    'dial': DialPriorityQueue,  # keys must be finite
+}
+
+# Queues that also count their own work into a SearchStats; the others only get the search's counters
+INSTRUMENTED_QUEUES = {
+    'heap': InstrumentedHeapPriorityQueue,
+    'array': InstrumentedLinearPriorityQueue,
+}
+
+def find_shortest_path(
         graph: dict[int, dict[int, float]],
         source: int,
-        target: int
+        target: int,
+        queue: str = 'heap',
+        stats: SearchStats | None = None
 ) -> tuple[list[int], float]:
     """
     Find the shortest (least-cost) path from `source` to `target` in `graph`
-    using the heap-based algorithm.
+    with Dijkstra's algorithm, using the priority queue named `queue` (see PRIORITY_QUEUES).
+
+    Queues may hand back outdated entries for a node; they are skipped.
+    If `stats` is given, the search is counted and timed into it, and queues in
+    INSTRUMENTED_QUEUES count their own work too.
 
     Return:
         - the list of nodes (including `source` and `target`)
         - the cost of the path
     """
+    if stats is not None:
+        start = perf_counter()
+        pq = INSTRUMENTED_QUEUES[queue](stats) if queue in INSTRUMENTED_QUEUES else PRIORITY_QUEUES[queue]()
+    else:
+        pq = PRIORITY_QUEUES[queue]()
+
     path_to_target: list[int] = []
-    pq: HeapPriorityQueue = HeapPriorityQueue()
     pq.make(graph)
     pq.update(0, source)
     dist: dict[int, float] = {node:INFINITY for node in graph}
     dist[source] = 0
     predecessor: dict[int, int] = {node:None for node in graph}
+    if stats is not None:
+        searching = perf_counter()
+        stats.setup_time += searching - start
+
     while (not pq.is_empty()):
         distance, node = pq.pop_min()
         if (node == target):
+            if stats is not None:
+                stats.n_nodes_settled += 1
             break
 
         if (distance > dist[node]):
             continue
 
+        if stats is not None:
+            stats.n_nodes_settled += 1
+            stats.n_edges_relaxed += len(graph[node])
         for neighbor,weight in graph[node].items():
             new_distance = dist[node] + weight
             if new_distance < dist[neighbor]:
                 dist[neighbor] = new_distance
                 predecessor[neighbor] = node
                 pq.update(new_distance, neighbor)
+                if stats is not None:
+                    stats.n_decrease_keys += 1
+
+    if stats is not None:
+        walking = perf_counter()
+        stats.search_time += walking - searching
 
     if (dist[target] == INFINITY):
+        if stats is not None:
+            stats.path_time += perf_counter() - walking
         return [], INFINITY
 
     next_node: int = target
@@ -46,53 +103,418 @@ def find_shortest_path_with_heap(
         next_node = predecessor[next_node]
 
     path_to_target.reverse()
+    if stats is not None:
+        stats.path_time += perf_counter() - walking
 
     return path_to_target, dist[target]
 
+def find_shortest_path_with_heap(
+        graph: dict[int, dict[int, float]],
+        source: int,
+        target: int,
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    Find the shortest (least-cost) path from `source` to `target` in `graph`
+    using the heap-based algorithm.
+
+    If `stats` is given, it collects settled nodes, relaxed edges, decrease-keys,
+    heap swaps, the peak number of queued (reached, unsettled) nodes and the time spent in each phase.
+
+    Return:
+        - the list of nodes (including `source` and `target`)
+        - the cost of the path
+    """
+    return find_shortest_path(graph, source, target, 'heap', stats)
+
 def find_shortest_path_with_array(
         graph: dict[int, dict[int, float]],
         source: int,
-        target: int
+        target: int,
+        stats: SearchStats | None = None
 ) -> tuple[list[int], float]:
     """
     Find the shortest (least-cost) path from `source` to `target` in `graph`
     using the array-based (linear lookup) algorithm.
 
+    If `stats` is given, it collects the same counters as find_shortest_path_with_heap,
+    with the entries scanned by each pop_min as the sift steps.
+
     Return:
         - the list of nodes (including `source` and `target`)
         - the cost of the path
     """
-    path_to_target: list[int] = []
-    pq: LinearPriorityQueue = LinearPriorityQueue()
+    return find_shortest_path(graph, source, target, 'array', stats)
+
+def find_shortest_path_with_heap_csr(
+        graph: CSRGraph,
+        source: int,
+        target: int,
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    Same as find_shortest_path_with_heap, over a CSRGraph.
+    """
+    return find_shortest_path_csr(graph, source, target, 'heap', stats)
+
+def find_shortest_path_with_array_csr(
+        graph: CSRGraph,
+        source: int,
+        target: int,
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    Same as find_shortest_path_with_array, over a CSRGraph.
+    """
+    return find_shortest_path_csr(graph, source, target, 'array', stats)
+
+def find_shortest_path_csr(
+        graph: CSRGraph,
+        source: int,
+        target: int,
+        queue: str = 'heap',
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    Same as find_shortest_path, over a CSRGraph.
+    """
+    if stats is not None and queue in INSTRUMENTED_QUEUES:
+        return _find_shortest_path_csr(graph, source, target, INSTRUMENTED_QUEUES[queue](stats), stats)
+    return _find_shortest_path_csr(graph, source, target, PRIORITY_QUEUES[queue](), stats)
+
+def _find_shortest_path_csr(
+        graph: CSRGraph,
+        source: int,
+        target: int,
+        pq,
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    if stats is not None:
+        start = perf_counter()
+    n = graph.num_nodes
+    indptr = graph.indptr
+    indices = graph.indices
+    weights = graph.weights
+
     pq.make(graph)
     pq.update(0, source)
-    dist = {node:INFINITY for node in graph}
+    dist: list[float] = [INFINITY] * n
     dist[source] = 0
-    predecessor: dict[int, int] = {node:None for node in graph}
+    predecessor: list[int] = [-1] * n
+    if stats is not None:
+        searching = perf_counter()
+        stats.setup_time += searching - start
+
     while (not pq.is_empty()):
         distance, node = pq.pop_min()
         if (node == target):
+            if stats is not None:
+                stats.n_nodes_settled += 1
             break
 
         if (distance > dist[node]):
             continue
 
-        for neighbor,weight in graph[node].items():
+        start, end = indptr[node], indptr[node + 1]
+        if stats is not None:
+            stats.n_nodes_settled += 1
+            stats.n_edges_relaxed += int(end - start)
+        for neighbor, weight in zip(indices[start:end].tolist(), weights[start:end].tolist()):
             new_distance = dist[node] + weight
             if new_distance < dist[neighbor]:
                 dist[neighbor] = new_distance
                 predecessor[neighbor] = node
                 pq.update(new_distance, neighbor)
+                if stats is not None:
+                    stats.n_decrease_keys += 1
+
+    if stats is not None:
+        walking = perf_counter()
+        stats.search_time += walking - searching
 
     if (dist[target] == INFINITY):
+        if stats is not None:
+            stats.path_time += perf_counter() - walking
         return [], INFINITY
 
+    path_to_target: list[int] = []
     next_node: int = target
+    while next_node != -1:
+        path_to_target.append(next_node)
+        next_node = predecessor[next_node]
+
+    path_to_target.reverse()
+    if stats is not None:
+        stats.path_time += perf_counter() - walking
+
+    return path_to_target, dist[target]
+
+def reverse_graph(graph: dict[int, dict[int, float]]) -> dict[int, dict[int, float]]:
+    """
+    The same graph with every edge pointing the other way.
+    """
+    reverse: dict[int, dict[int, float]] = {node: {} for node in graph}
+    for node, edges in graph.items():
+        for neighbor, weight in edges.items():
+            reverse[neighbor][node] = weight
+    return reverse
+
+def find_shortest_path_bidirectional(
+        graph: dict[int, dict[int, float]],
+        source: int,
+        target: int,
+        reverse: dict[int, dict[int, float]] | None = None,
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    Find the shortest (least-cost) path from `source` to `target` in `graph`
+    by searching forward from `source` and backward from `target` at the same time.
+
+    The two searches take turns settling a node. `mu` is the cheapest source-target
+    path seen where they touch, and the search stops once the two frontiers' smallest
+    distances add up to at least `mu`: no path through unsettled nodes can beat it.
+
+    Pass `reverse` (from reverse_graph) to reuse it across queries.
+    If given, `stats` counts the settled nodes of both searches.
+
+    Return:
+        - the list of nodes (including `source` and `target`)
+        - the cost of the path
+    """
+    if reverse is None:
+        reverse = reverse_graph(graph)
+
+    if source == target:
+        return [source], 0
+
+    # Index 0 searches forward over `graph`, index 1 backward over `reverse`
+    edges = (graph, reverse)
+    dist: tuple[dict[int, float], dict[int, float]] = ({source: 0}, {target: 0})
+    predecessor: tuple[dict[int, int], dict[int, int]] = ({source: None}, {target: None})
+    settled: tuple[set[int], set[int]] = (set(), set())
+    queues: tuple[list, list] = ([(0, source)], [(0, target)])
+
+    mu = INFINITY
+    meeting_node = None
+    side = 0
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= mu:
+            break
+
+        distance, node = heapq.heappop(queues[side])
+        if node in settled[side]:
+            continue
+        settled[side].add(node)
+        if stats is not None:
+            stats.n_nodes_settled += 1
+
+        other = 1 - side
+        for neighbor, weight in edges[side][node].items():
+            new_distance = distance + weight
+            if new_distance < dist[side].get(neighbor, INFINITY):
+                dist[side][neighbor] = new_distance
+                predecessor[side][neighbor] = node
+                heapq.heappush(queues[side], (new_distance, neighbor))
+            if neighbor in dist[other] and new_distance + dist[other][neighbor] < mu:
+                mu = new_distance + dist[other][neighbor]
+                meeting_node = neighbor
+
+        side = other
+
+    if meeting_node is None:
+        return [], INFINITY
+
+    path_to_target: list[int] = []
+    next_node = meeting_node
+    while next_node is not None:
+        path_to_target.append(next_node)
+        next_node = predecessor[0][next_node]
+    path_to_target.reverse()
+
+    next_node = predecessor[1][meeting_node]
+    while next_node is not None:
+        path_to_target.append(next_node)
+        next_node = predecessor[1][next_node]
+
+    # Add the edges up in path order so the cost matches the one-directional finders exactly
+    cost = 0
+    for node, neighbor in zip(path_to_target[:-1], path_to_target[1:]):
+        cost += graph[node][neighbor]
+
+    return path_to_target, cost
+
+def admissible_scale(
+        graph: dict[int, dict[int, float]],
+        positions: list[tuple[float, float]]
+) -> float:
+    """
+    The largest factor by which the straight-line distance can be scaled and still
+    never exceed an edge's weight. Noisy weights can undercut the straight line, so this
+    is often below 1.
+    """
+    scale = INFINITY
+    for node, edges in graph.items():
+        for neighbor, weight in edges.items():
+            straight = math.dist(positions[node], positions[neighbor])
+            if straight > 0:
+                scale = min(scale, weight / straight)
+    return scale
+
+def find_shortest_path_astar(
+        graph: dict[int, dict[int, float]],
+        positions: list[tuple[float, float]],
+        source: int,
+        target: int,
+        scale: float = 1.0,
+        weight: float = 1.0,
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    Find a least-cost path from `source` to `target` with A*, guided by
+    `scale` times the straight-line distance to `target`.
+
+    The path is optimal when no edge costs less than `scale` times its straight-line length.
+    To be sure of that, pass scale=min(1, admissible_scale(graph, positions)); it scans every
+    edge, so work it out once per graph (and again after changing the graph), not per query.
+    `weight` > 1 runs weighted A*: the heuristic counts `weight` times,
+    which settles fewer nodes and returns a path costing at most `weight` times the optimum
+    (as long as the scaled heuristic is admissible).
+
+    Return:
+        - the list of nodes (including `source` and `target`)
+        - the cost of the path
+    """
+    target_position = positions[target]
+    factor = scale * weight
+
+    def heuristic(node: int) -> float:
+        return factor * math.dist(positions[node], target_position)
+
+    return find_shortest_path_with_heuristic(graph, source, target, heuristic, stats)
+
+def find_shortest_path_with_heuristic(
+        graph: dict[int, dict[int, float]],
+        source: int,
+        target: int,
+        heuristic: Callable[[int], float],
+        stats: SearchStats | None = None
+) -> tuple[list[int], float]:
+    """
+    A* from `source` to `target`, where `heuristic(node)` estimates the cost from node to `target`.
+    Nodes are settled once and never reopened.
+
+    Return:
+        - the list of nodes (including `source` and `target`)
+        - the cost of the path
+    """
+    dist: dict[int, float] = {source: 0}
+    predecessor: dict[int, int] = {source: None}
+    settled: set[int] = set()
+    queue = [(heuristic(source), source)]
+    while queue:
+        _, node = heapq.heappop(queue)
+        if node in settled:
+            continue
+        settled.add(node)
+        if stats is not None:
+            stats.n_nodes_settled += 1
+        if node == target:
+            break
+
+        for neighbor, weight in graph[node].items():
+            if neighbor in settled:
+                continue
+            new_distance = dist[node] + weight
+            if new_distance < dist.get(neighbor, INFINITY):
+                dist[neighbor] = new_distance
+                predecessor[neighbor] = node
+                heapq.heappush(queue, (new_distance + heuristic(neighbor), neighbor))
+
+    if target not in settled:
+        return [], INFINITY
+
+    path_to_target: list[int] = []
+    next_node = target
     while next_node is not None:
         path_to_target.append(next_node)
         next_node = predecessor[next_node]
-        
+
     path_to_target.reverse()
 
     return path_to_target, dist[target]
 
+def find_shortest_path_delta_stepping(
+        graph: dict[int, dict[int, float]],
+        source: int,
+        target: int,
+        delta: float = 0.1
+) -> tuple[list[int], float]:
+    """
+    Find the shortest (least-cost) path from `source` to `target` in `graph`
+    with Δ-stepping.
+
+    Tentative distances are kept in buckets `delta` wide. The lowest bucket is emptied
+    by relaxing only the light edges (weight <= delta) of its nodes, again and again,
+    since those can put nodes back into the same bucket. The heavy edges of every node
+    that passed through the bucket are relaxed once afterwards; they can only reach
+    later buckets. Once the bucket holding `target` is done, its distance is final.
+
+    Return:
+        - the list of nodes (including `source` and `target`)
+        - the cost of the path
+    """
+    if delta <= 0:
+        raise ValueError('delta must be positive')
+
+    dist: dict[int, float] = {source: 0}
+    predecessor: dict[int, int] = {source: None}
+    buckets: dict[int, set[int]] = {0: {source}}
+
+    def relax(node: int, neighbor: int, new_distance: float):
+        if new_distance < dist.get(neighbor, INFINITY):
+            if neighbor in dist:
+                # Its old bucket may already have been taken for processing
+                buckets.get(int(dist[neighbor] // delta), set()).discard(neighbor)
+            dist[neighbor] = new_distance
+            predecessor[neighbor] = node
+            buckets.setdefault(int(new_distance // delta), set()).add(neighbor)
+
+    while buckets:
+        index = min(buckets)
+        settled: set[int] = set()
+
+        # Light phase: repeat until the bucket stops refilling itself
+        while buckets.get(index):
+            frontier = buckets.pop(index)
+            settled |= frontier
+            for node in frontier:
+                for neighbor, weight in graph[node].items():
+                    if weight <= delta:
+                        relax(node, neighbor, dist[node] + weight)
+        buckets.pop(index, None)
+
+        # Heavy phase: one pass over the edges that jump to later buckets
+        for node in settled:
+            for neighbor, weight in graph[node].items():
+                if weight > delta:
+                    relax(node, neighbor, dist[node] + weight)
+
+        if target in settled:
+            break
+
+        # Relaxing can leave empty buckets behind
+        for empty in [i for i, nodes in buckets.items() if not nodes]:
+            del buckets[empty]
+
+    if target not in dist:
+        return [], INFINITY
+
+    path_to_target: list[int] = []
+    next_node = target
+    while next_node is not None:
+        path_to_target.append(next_node)
+        next_node = predecessor[next_node]
+
+    path_to_target.reverse()
+
+    return path_to_target, dist[target]
@@ -0,0 +1,111 @@
+class _PairingNode:
+    __slots__ = ('distance', 'node', 'child', 'sibling', 'prev')
+
+    def __init__(self, distance: float, node: int):
+        self.distance = distance
+        self.node = node
+        self.child: '_PairingNode | None' = None
+        self.sibling: '_PairingNode | None' = None
+        self.prev: '_PairingNode | None' = None  # parent if first child, else previous sibling
+
+
+def _meld(a: _PairingNode | None, b: _PairingNode | None) -> _PairingNode | None:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if b.distance < a.distance:
+        a, b = b, a
+    # b becomes a's first child
+    b.prev = a
+    b.sibling = a.child
+    if a.child is not None:
+        a.child.prev = b
+    a.child = b
+    a.sibling = None
+    a.prev = None
+    return a
+
+
+class PairingHeapPriorityQueue:
+    """
+    Pairing heap with real decrease-key: O(1) push and decrease-key,
+    O(log n) amortized pop_min.
+    """
+
+    def __init__(self):
+        self.root: _PairingNode | None = None
+        self.handles: dict[int, _PairingNode] = {}
+
+    def make(self, graph):
+        return
+
+    def push(self, distance: float, node: int):
+        handle = _PairingNode(distance, node)
+        self.handles[node] = handle
+        self.root = _meld(self.root, handle)
+
+    def update(self, new_distance: float, node: int):
+        handle = self.handles.get(node)
+        if handle is None:
+            self.push(new_distance, node)
+            return
+        if new_distance >= handle.distance:
+            # Only decreases are cheap; anything else re-inserts the node
+            self._remove(handle)
+            self.push(new_distance, node)
+            return
+
+        handle.distance = new_distance
+        if handle is not self.root:
+            self._cut(handle)
+            self.root = _meld(self.root, handle)
+
+    def _cut(self, handle: _PairingNode):
+        # Detach `handle` (with its subtree) from its parent or previous sibling
+        if handle.prev.child is handle:
+            handle.prev.child = handle.sibling
+        else:
+            handle.prev.sibling = handle.sibling
+        if handle.sibling is not None:
+            handle.sibling.prev = handle.prev
+        handle.sibling = None
+        handle.prev = None
+
+    def _remove(self, handle: _PairingNode):
+        if handle is self.root:
+            self.root = self._merge_children(handle)
+        else:
+            self._cut(handle)
+            self.root = _meld(self.root, self._merge_children(handle))
+        del self.handles[handle.node]
+
+    def _merge_children(self, handle: _PairingNode) -> _PairingNode | None:
+        # Two-pass pairing: meld children in pairs left to right, then fold the pairs right to left
+        pairs = []
+        child = handle.child
+        while child is not None:
+            first = child
+            second = child.sibling
+            child = second.sibling if second is not None else None
+            first.sibling = first.prev = None
+            if second is not None:
+                second.sibling = second.prev = None
+            pairs.append(_meld(first, second))
+        handle.child = None
+
+        merged = None
+        for tree in reversed(pairs):
+            merged = _meld(tree, merged)
+        return merged
+
+    def pop_min(self) -> tuple[float, int]:
+        if self.root is None:
+            raise IndexError('Trying to pop from an empty queue')
+        root = self.root
+        self.root = self._merge_children(root)
+        del self.handles[root.node]
+        return root.distance, root.node
+
+    def is_empty(self) -> bool:
+        return self.root is None
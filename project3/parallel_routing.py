@@ -0,0 +1,207 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from shared_graph import SharedCSRGraph, attach_worker, worker_graph
+
+INFINITY = float('inf')
+
+# Frontiers with fewer out-edges than this are relaxed in-process;
+# shipping them to the pool costs more than the relaxations themselves
+PARALLEL_THRESHOLD = 50_000
+
+def _relax(graph: CSRGraph, nodes: np.ndarray, node_dist: np.ndarray,
+           delta: float, light: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Relaxation requests for the light (weight <= delta) or heavy out-edges of `nodes`,
+    whose distances are `node_dist`.
+
+    Return (targets, distances, predecessors), with only the best request per target.
+    """
+    starts = graph.indptr[nodes]
+    counts = graph.indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    # Positions of every edge leaving `nodes`, without a Python loop over the nodes
+    first = np.cumsum(counts) - counts
+    edges = np.repeat(starts - first, counts) + np.arange(total)
+    weights = graph.weights[edges]
+    keep = weights <= delta if light else weights > delta
+
+    sources = np.repeat(np.arange(len(nodes)), counts)[keep]
+    targets = graph.indices[edges[keep]].astype(np.int64)
+    distances = node_dist[sources] + weights[keep]
+    return _best_requests(targets, distances, nodes[sources])
+
+
+def _best_requests(targets: np.ndarray, distances: np.ndarray,
+                   predecessors: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Sort by target, then distance, and keep the first request for each target
+    order = np.lexsort((distances, targets))
+    targets = targets[order]
+    first = np.ones(len(targets), dtype=bool)
+    first[1:] = targets[1:] != targets[:-1]
+    return targets[first], distances[order][first], predecessors[order][first]
+
+
+def _relax_in_worker(nodes: np.ndarray, node_dist: np.ndarray,
+                     delta: float, light: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _relax(worker_graph(), nodes, node_dist, delta, light)
+
+
+class ParallelDeltaStepping:
+    """
+    Δ-stepping over a CSRGraph, with each bucket's relaxations split across a process pool.
+
+    The graph is copied into shared memory once; workers attach to it by name.
+    For a bucket, every worker gets a slice of the frontier (balanced by out-edges)
+    and returns its best relaxation request per target node. The requests are reduced
+    with a vectorized minimum and applied here, where the distances live.
+
+    With workers=1 there is no pool, and every relaxation runs in this process.
+    Use as a context manager so the pool and the shared memory are released.
+    """
+
+    def __init__(self, graph: CSRGraph, workers: int | None = None, delta: float = 0.1):
+        if delta <= 0:
+            raise ValueError('delta must be positive')
+        self.workers = workers or os.cpu_count() or 1
+        self.delta = delta
+        self.graph = graph
+        self.shared = None
+        self.pool = None
+        if self.workers > 1:
+            self.shared = SharedCSRGraph(graph)
+            self.pool = ProcessPoolExecutor(self.workers, initializer=attach_worker,
+                                            initargs=(self.shared.spec,))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
+
+    def __enter__(self) -> 'ParallelDeltaStepping':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _relax(self, nodes: np.ndarray, dist: np.ndarray, light: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        indptr = self.graph.indptr
+        out_edges = np.cumsum(indptr[nodes + 1] - indptr[nodes])
+        if self.pool is None or len(nodes) < self.workers or out_edges[-1] < PARALLEL_THRESHOLD:
+            return _relax(self.graph, nodes, dist[nodes], self.delta, light)
+
+        # Cut the frontier where each worker gets about the same number of edges
+        cuts = np.searchsorted(out_edges, out_edges[-1] * np.arange(1, self.workers) / self.workers)
+        futures = [
+            self.pool.submit(_relax_in_worker, part, dist[part], self.delta, light)
+            for part in np.split(nodes, cuts) if len(part)
+        ]
+        results = [future.result() for future in futures]
+        return _best_requests(*(np.concatenate(arrays) for arrays in zip(*results)))
+
+    def distances(self, source: int, target: int = -1) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Distances from `source` and the predecessor of each node on its shortest path
+        (-1 for `source` and unreached nodes).
+
+        If `target` is given, stop once its distance is final; other distances may then be unfinished.
+        """
+        n = self.graph.num_nodes
+        delta = self.delta
+        dist = np.full(n, INFINITY)
+        predecessor = np.full(n, -1, dtype=np.int64)
+        queued = np.zeros(n, dtype=bool)
+        # Bucket index -> arrays of nodes put there; entries go stale when a node moves down
+        buckets: dict[int, list[np.ndarray]] = {0: [np.array([source])]}
+        dist[source] = 0
+        queued[source] = True
+
+        def apply(targets: np.ndarray, distances: np.ndarray, predecessors: np.ndarray):
+            better = distances < dist[targets]
+            targets = targets[better]
+            distances = distances[better]
+            dist[targets] = distances
+            predecessor[targets] = predecessors[better]
+            queued[targets] = True
+            indexes = (distances // delta).astype(np.int64)
+            order = np.argsort(indexes, kind='stable')
+            indexes = indexes[order]
+            starts = np.flatnonzero(np.r_[True, indexes[1:] != indexes[:-1]]) if len(indexes) else []
+            for start, end in zip(starts, list(starts[1:]) + [len(indexes)]):
+                buckets.setdefault(int(indexes[start]), []).append(targets[order[start:end]])
+
+        def take(index: int) -> np.ndarray:
+            nodes = np.unique(np.concatenate(buckets.pop(index)))
+            nodes = nodes[queued[nodes] & ((dist[nodes] // delta) == index)]
+            queued[nodes] = False
+            return nodes
+
+        while buckets:
+            index = min(buckets)
+            settled = []
+
+            # Light phase: repeat until the bucket stops refilling itself
+            while index in buckets:
+                frontier = take(index)
+                if len(frontier) == 0:
+                    continue
+                settled.append(frontier)
+                apply(*self._relax(frontier, dist, light=True))
+
+            if not settled:
+                continue
+
+            # Heavy phase: one pass over the edges that jump to later buckets
+            settled = np.concatenate(settled)
+            apply(*self._relax(settled, dist, light=False))
+
+            if target >= 0 and dist[target] < (index + 1) * delta:
+                break
+
+        return dist, predecessor
+
+    def shortest_path(self, source: int, target: int) -> tuple[list[int], float]:
+        dist, predecessor = self.distances(source, target)
+        if dist[target] == INFINITY:
+            return [], INFINITY
+
+        path_to_target: list[int] = []
+        next_node: int = target
+        while next_node != -1:
+            path_to_target.append(next_node)
+            next_node = int(predecessor[next_node])
+
+        path_to_target.reverse()
+
+        return path_to_target, float(dist[target])
+
+
+def find_shortest_path_parallel(
+        graph: CSRGraph,
+        source: int,
+        target: int,
+        workers: int | None = None,
+        delta: float = 0.1
+) -> tuple[list[int], float]:
+    """
+    Find the shortest (least-cost) path from `source` to `target` in `graph`
+    with Δ-stepping spread over `workers` processes (all cores by default).
+
+    Starting the pool and sharing the graph is paid on every call;
+    keep a ParallelDeltaStepping open to answer many queries.
+
+    Return:
+        - the list of nodes (including `source` and `target`)
+        - the cost of the path
+    """
+    with ParallelDeltaStepping(graph, workers, delta) as engine:
+        return engine.shortest_path(source, target)
@@ -0,0 +1,80 @@
+import struct
+
+_DOUBLE = struct.Struct('<d')
+_BITS = struct.Struct('<Q')
+
+
+def _key_bits(distance: float) -> int:
+    # The bits of a non-negative double sort in the same order as the double itself
+    return _BITS.unpack(_DOUBLE.pack(distance))[0]
+
+
+class RadixHeapPriorityQueue:
+    """
+    Radix heap for monotone, non-negative keys (every pushed distance is at least
+    the last popped one, as in Dijkstra with non-negative weights).
+
+    Bucket i holds entries whose key bits first differ from the last popped key's at bit i - 1,
+    so an entry only ever moves to lower buckets: O(log C) amortized per entry.
+    Decrease-key pushes a new entry; outdated ones are skipped when popped.
+    """
+
+    def __init__(self):
+        self.buckets: list[list[tuple[int, float, int]]] = [[] for _ in range(65)]
+        self.last = 0
+        self.distances: dict[int, float] = {}  # latest distance of each queued node
+        self.count = 0  # entries in the buckets, outdated ones included
+
+    def make(self, graph):
+        return
+
+    def push(self, distance: float, node: int):
+        if distance < 0:
+            raise ValueError('A radix heap only holds non-negative distances')
+        bits = _key_bits(distance)
+        if bits < self.last:
+            raise ValueError('A radix heap needs monotone keys: pushed below the last popped distance')
+        self.distances[node] = distance
+        self.buckets[(bits ^ self.last).bit_length()].append((bits, distance, node))
+        self.count += 1
+
+    def update(self, new_distance: float, node: int):
+        self.push(new_distance, node)
+
+    def _refill(self) -> bool:
+        """
+        Make bucket 0 (entries equal to the last popped key) hold a current entry.
+        Return False if the queue is empty.
+        """
+        buckets = self.buckets
+        while True:
+            bucket = buckets[0]
+            while bucket:
+                _, distance, node = bucket[-1]
+                if self.distances.get(node) == distance:
+                    return True
+                bucket.pop()
+                self.count -= 1
+
+            if self.count == 0:
+                return False
+
+            i = 1
+            while not buckets[i]:
+                i += 1
+            entries = buckets[i]
+            buckets[i] = []
+            self.last = min(entries)[0]
+            for entry in entries:
+                buckets[(entry[0] ^ self.last).bit_length()].append(entry)
+
+    def pop_min(self) -> tuple[float, int]:
+        if not self._refill():
+            raise IndexError('Trying to pop from an empty queue')
+        _, distance, node = self.buckets[0].pop()
+        self.count -= 1
+        del self.distances[node]
+        return distance, node
+
+    def is_empty(self) -> bool:
+        return not self.distances
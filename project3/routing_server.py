@@ -0,0 +1,326 @@
+import argparse
+import asyncio
+import bisect
+import contextlib
+import functools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from csr_graph import CSRGraph
+from batch_routing import route_in_worker
+from shared_graph import SharedCSRGraph, attach_worker
+
+# Upper bounds (in milliseconds) of the latency histogram buckets; the last one is open-ended
+LATENCY_BUCKETS = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf')]
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0
+
+    def add(self, milliseconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, milliseconds)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the `q` quantile.
+        """
+        rank = q * self.total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank and seen > 0:
+                return bound
+        return 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'buckets': {f'le_{bound}': count for bound, count in zip(LATENCY_BUCKETS, self.counts)},
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+        }
+
+
+class RoutingServer:
+    """
+    Answers shortest-path queries over TCP, one JSON object per line.
+
+    Requests are {"id": ..., "source": s, "target": t}, answered with
+    {"id": ..., "path": [...], "cost": c} (cost null if unreachable), or {"op": "stats"}.
+    Answers on a connection can come back in any order; match them by id.
+
+    Searches run in a process pool that reads the graph from shared memory, at most one per
+    worker at a time. Requests wait in a queue of `max_pending`; when it is full, connections
+    stop being read, which pushes back on clients through TCP. A connection whose client is slow
+    to read its answers is not read either, so unsent answers cannot pile up in memory.
+    When a worker frees up, every waiting request with the same source as the oldest one
+    is answered by a single search.
+    """
+
+    def __init__(self, graph: CSRGraph, workers: int | None = None, max_pending: int = 1024):
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.shared = None
+        self.pool = None
+        self.server = None
+        self.dispatcher = None
+        self.connections: set[asyncio.Task] = set()
+        self.searches: set[asyncio.Task] = set()
+        self.queue: asyncio.Queue | None = None
+        self.waiting: dict[int, list] = {}  # source -> (target, future) pairs not yet searched
+        self.n_waiting = 0
+        self.n_requests = 0
+        self.n_searches = 0
+        self.latency = LatencyHistogram()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> tuple[str, int]:
+        """
+        Start serving; port 0 picks a free port. Return the address actually bound.
+        """
+        self.shared = SharedCSRGraph(self.graph)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=attach_worker, initargs=(self.shared.spec,))
+        self.queue = asyncio.Queue(self.max_pending)
+        self.slots = asyncio.Semaphore(self.workers)
+        self.dispatcher = asyncio.create_task(self._dispatch())
+        self.server = await asyncio.start_server(self._serve, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            for connection in self.connections:
+                connection.cancel()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.dispatcher
+        for search in self.searches:
+            search.cancel()
+        await asyncio.gather(*self.searches, return_exceptions=True)
+        if self.pool is not None:
+            # Waiting for the workers to exit blocks, so it happens off the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self.pool.shutdown, cancel_futures=True)
+            )
+        if self.shared is not None:
+            self.shared.close()
+        self.server = self.dispatcher = self.pool = self.shared = None
+
+    async def __aenter__(self) -> 'RoutingServer':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def stats(self) -> dict:
+        return {
+            'requests': self.n_requests,
+            'searches': self.n_searches,
+            'queued': self.queue.qsize() + self.n_waiting,
+            'latency_ms': self.latency.to_dict(),
+        }
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = asyncio.current_task()
+        self.connections.add(connection)
+        answers = set()
+        try:
+            while line := await reader.readline():
+                request = None
+                try:
+                    request = json.loads(line)
+                    if request.get('op') == 'stats':
+                        await self._send(writer, {'id': request.get('id'), 'stats': self.stats()})
+                        continue
+                    source, target = int(request['source']), int(request['target'])
+                    if not (0 <= source < self.graph.num_nodes and 0 <= target < self.graph.num_nodes):
+                        raise ValueError('source and target must be nodes of the graph')
+                except (ValueError, KeyError, TypeError, AttributeError) as error:
+                    await self._send(writer, {'id': request.get('id') if isinstance(request, dict) else None,
+                                              'error': str(error)})
+                    continue
+
+                # Stop reading while the client is slow to take its answers, so they cannot pile up
+                await writer.drain()
+                future = asyncio.get_running_loop().create_future()
+                # Blocks while the queue is full, so this connection stops being read
+                await self.queue.put((source, target, future))
+                self.n_requests += 1
+                task = asyncio.create_task(self._answer(writer, request.get('id'), future, perf_counter()))
+                answers.add(task)
+                task.add_done_callback(answers.discard)
+            if answers:
+                await asyncio.wait(answers)
+        except asyncio.CancelledError:
+            # The server is closing; end quietly rather than surface the cancellation to asyncio's callback
+            for task in answers:
+                task.cancel()
+        except ConnectionError:
+            # The client went away
+            pass
+        finally:
+            self.connections.discard(connection)
+            writer.close()
+
+    async def _answer(self, writer: asyncio.StreamWriter, request_id, future: asyncio.Future, start: float):
+        try:
+            path, cost = await future
+        except Exception as error:
+            await self._send(writer, {'id': request_id, 'error': str(error)})
+            return
+        self.latency.add((perf_counter() - start) * 1000)
+        await self._send(writer, {'id': request_id, 'path': path, 'cost': cost if path else None})
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: dict):
+        if writer.is_closing():
+            return
+        writer.write(json.dumps(message).encode() + b'\n')
+        try:
+            # Waits while a slow client leaves answers piling up in the buffer
+            await writer.drain()
+        except ConnectionError:
+            # The client went away; its remaining answers are dropped
+            pass
+
+    def _take_queued(self):
+        # Move queued requests into `waiting`, grouped by source, up to max_pending of them
+        while self.n_waiting < self.max_pending and not self.queue.empty():
+            source, target, future = self.queue.get_nowait()
+            self.waiting.setdefault(source, []).append((target, future))
+            self.n_waiting += 1
+
+    async def _dispatch(self):
+        while True:
+            await self.slots.acquire()
+            if not self.waiting:
+                source, target, future = await self.queue.get()
+                self.waiting[source] = [(target, future)]
+                self.n_waiting += 1
+            self._take_queued()
+
+            # The oldest source goes first, with everything that queued up for it meanwhile
+            source = next(iter(self.waiting))
+            requests = self.waiting.pop(source)
+            self.n_waiting -= len(requests)
+            self.n_searches += 1
+            # The event loop only keeps a weak reference to tasks
+            search = asyncio.create_task(self._search(source, requests))
+            self.searches.add(search)
+            search.add_done_callback(self.searches.discard)
+
+    async def _search(self, source: int, requests: list):
+        try:
+            targets = list(dict.fromkeys(target for target, _ in requests))
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.pool, route_in_worker, (source, targets)
+            )
+            answers = dict(zip(targets, results))
+            for target, future in requests:
+                if not future.done():
+                    future.set_result(answers[target])
+        except Exception as error:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            # Leaves answered futures alone; a cancelled search cancels the ones still waiting on it
+            for _, future in requests:
+                future.cancel()
+            self.slots.release()
+
+
+async def generate_load(host: str, port: int, queries: list[tuple[int, int]], connections: int = 8) -> dict:
+    """
+    Send `queries` to a RoutingServer over `connections` connections, all pipelined at once.
+
+    Return the answers (in the order of `queries`), the server's stats afterwards,
+    and the client-side throughput.
+    """
+    answers: list = [None] * len(queries)
+
+    async def client(indexes: list[int]):
+        reader, writer = await asyncio.open_connection(host, port)
+        for index in indexes:
+            source, target = queries[index]
+            writer.write(json.dumps({'id': index, 'source': source, 'target': target}).encode() + b'\n')
+        await writer.drain()
+        for _ in indexes:
+            answer = json.loads(await reader.readline())
+            answers[answer['id']] = answer
+        writer.close()
+        await writer.wait_closed()
+
+    start = perf_counter()
+    await asyncio.gather(*(client(list(range(i, len(queries), connections))) for i in range(connections)))
+    elapsed = perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"op": "stats"}\n')
+    stats = json.loads(await reader.readline())['stats']
+    writer.close()
+    await writer.wait_closed()
+
+    return {'answers': answers, 'stats': stats, 'queries_per_second': len(queries) / elapsed}
+
+
+async def _serve_forever(graph: CSRGraph, host: str, port: int, workers: int | None, max_pending: int):
+    async with RoutingServer(graph, workers, max_pending) as server:
+        host, port = await server.start(host, port)
+        print(f'Serving {graph.num_nodes} nodes and {graph.num_edges} edges on {host}:{port}')
+        await asyncio.Event().wait()
+
+
+async def _self_test(graph: CSRGraph, workers: int | None, max_pending: int,
+                     n_queries: int, sources: int, connections: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    starts = [rng.randrange(graph.num_nodes) for _ in range(sources)]
+    queries = [(rng.choice(starts), rng.randrange(graph.num_nodes)) for _ in range(n_queries)]
+    async with RoutingServer(graph, workers, max_pending) as server:
+        host, port = await server.start()
+        return await generate_load(host, port, queries, connections)
+
+
+if __name__ == '__main__':
+    from generate import generate_graph_csr
+    from graph_file import load_graph
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['serve', 'load'],
+                        help='serve: run the server; load: start a local server and run the load generator on it')
+    parser.add_argument('--graph-file', default=None, help='Binary graph file to serve (else one is generated)')
+    parser.add_argument('-n', type=int, default=100000, help='The number of nodes to generate')
+    parser.add_argument('--density', type=float, default=0.0001, help='Fraction of non-inf edges')
+    parser.add_argument('--noise', type=float, default=0.02, help='How non-euclidean are the edge weights')
+    parser.add_argument('--seed', type=int, default=312, help='Random seed')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to serve on')
+    parser.add_argument('--port', type=int, default=8312, help='Port to serve on')
+    parser.add_argument('--workers', type=int, default=None, help='Search processes (all cores by default)')
+    parser.add_argument('--max-pending', type=int, default=1024, help='Requests queued before pushing back')
+    parser.add_argument('--queries', type=int, default=1000, help='Queries sent by the load generator')
+    parser.add_argument('--sources', type=int, default=50, help='Distinct sources among those queries')
+    parser.add_argument('--connections', type=int, default=16, help='Connections used by the load generator')
+    args = parser.parse_args()
+
+    if args.graph_file is not None:
+        _, graph = load_graph(args.graph_file)
+    else:
+        _, graph = generate_graph_csr(args.seed, args.n, args.density, args.noise)
+
+    if args.command == 'serve':
+        asyncio.run(_serve_forever(graph, args.host, args.port, args.workers, args.max_pending))
+    else:
+        result = asyncio.run(_self_test(graph, args.workers, args.max_pending, args.queries,
+                                        args.sources, args.connections, args.seed))
+        stats = result['stats']
+        print(f'{args.queries} queries: {result["queries_per_second"]:.1f} queries/sec, '
+              f'{stats["searches"]} searches, '
+              f'p50 <= {stats["latency_ms"]["p50"]} ms, p99 <= {stats["latency_ms"]["p99"]} ms')
@@ -0,0 +1,24 @@
+import dataclasses
+
+
+@dataclasses.dataclass
+class SearchStats:
+    n_nodes_settled: int = 0
+    n_edges_relaxed: int = 0  # edges looked at from settled nodes
+    n_decrease_keys: int = 0  # relaxations that lowered a distance
+    n_sift_steps: int = 0  # heap swaps, or entries scanned by pop_min for the array queue
+    max_queue_size: int = 0  # most reached but unsettled nodes queued at once (instrumented queues only)
+    setup_time: float = 0.0  # building the queue and distance tables
+    search_time: float = 0.0
+    path_time: float = 0.0  # walking the predecessors back from the target
+
+
+@dataclasses.dataclass
+class BatchStats:
+    n_queries: int = 0
+    n_searches: int = 0
+    time: float = 0.0
+
+    @property
+    def queries_per_second(self) -> float:
+        return self.n_queries / self.time if self.time > 0 else 0.0
@@ -0,0 +1,92 @@
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+# (shared memory name, dtype, length) for indptr, indices and weights
+SharedGraphSpec = tuple[tuple[str, str, int], ...]
+
+
+class SharedCSRGraph:
+    """
+    Copies a CSRGraph into shared memory once so worker processes can attach to it
+    by name instead of each receiving (and holding) their own copy.
+
+    Use as a context manager; the shared memory is released on exit.
+    Pass `spec` to worker processes and call attach_graph(spec) there.
+    """
+
+    def __init__(self, graph: CSRGraph):
+        self.blocks: list[shared_memory.SharedMemory] = []
+        arrays = []
+        for array in (graph.indptr, graph.indices, graph.weights):
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            shared[:] = array
+            self.blocks.append(block)
+            arrays.append(shared)
+
+        self.graph = CSRGraph(*arrays)
+        self.spec: SharedGraphSpec = tuple(
+            (block.name, array.dtype.str, len(array))
+            for block, array in zip(self.blocks, arrays)
+        )
+
+    def close(self):
+        self.graph = None
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> 'SharedCSRGraph':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Blocks attached by this process, kept open for as long as the process uses the graph
+_attached: list[shared_memory.SharedMemory] = []
+
+
+def _open_untracked(name: str) -> shared_memory.SharedMemory:
+    # The creating process owns the memory and unlinks it. Before 3.13 attaching always
+    # registers with the resource tracker, but pool workers share their parent's tracker,
+    # so that registration is the creator's own and goes away when the creator unlinks
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def attach_graph(spec: SharedGraphSpec) -> CSRGraph:
+    """
+    Open the CSRGraph described by `spec` (from SharedCSRGraph) without copying it.
+    """
+    arrays = []
+    for name, dtype, length in spec:
+        block = _open_untracked(name)
+        _attached.append(block)
+        arrays.append(np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf))
+    return CSRGraph(*arrays)
+
+
+# The graph this worker process attached to in attach_worker
+_worker_graph: CSRGraph | None = None
+
+
+def attach_worker(spec: SharedGraphSpec):
+    """
+    Process pool initializer: attach to the graph described by `spec` once per worker.
+    Tasks running in that worker then get it from worker_graph().
+    """
+    global _worker_graph
+    _worker_graph = attach_graph(spec)
+
+
+def worker_graph() -> CSRGraph:
+    if _worker_graph is None:
+        raise RuntimeError('This process has not attached to a graph (see attach_worker)')
+    return _worker_graph
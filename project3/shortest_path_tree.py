@@ -0,0 +1,142 @@
+import heapq
+from collections import OrderedDict
+
+INFINITY = float('inf')
+
+
+class ShortestPathTree:
+    """
+    Dijkstra from one source that can be paused and resumed.
+
+    Nodes are settled only as far as the queries so far needed; a query for a farther
+    target picks up the search where it stopped. `dist` and `predecessor` are indexed by
+    node (nodes must be numbered 0..n-1), with -1 as the predecessor of `source` and of
+    nodes not reached yet. Their entries are final for settled nodes.
+    """
+
+    def __init__(self, graph: dict[int, dict[int, float]], source: int):
+        self.graph = graph
+        self.source = source
+        self.dist: list[float] = [INFINITY] * len(graph)
+        self.predecessor: list[int] = [-1] * len(graph)
+        self.settled: list[bool] = [False] * len(graph)
+        self.dist[source] = 0
+        self.queue = [(0, source)]
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.queue
+
+    def settle(self, target: int = -1):
+        """
+        Continue the search until `target` is settled, or until every reachable node is
+        if `target` is -1 (or unreachable).
+        """
+        if target != -1 and self.settled[target]:
+            return
+
+        graph = self.graph
+        dist = self.dist
+        predecessor = self.predecessor
+        settled = self.settled
+        queue = self.queue
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if settled[node]:
+                continue
+            settled[node] = True
+
+            for neighbor, weight in graph[node].items():
+                new_distance = distance + weight
+                if new_distance < dist[neighbor]:
+                    dist[neighbor] = new_distance
+                    predecessor[neighbor] = node
+                    heapq.heappush(queue, (new_distance, neighbor))
+
+            if node == target:
+                break
+
+    def path_to(self, target: int) -> tuple[list[int], float]:
+        """
+        The shortest path from the source to `target`, settling more of the tree if needed.
+        Once `target` is settled this takes time proportional to the length of the path.
+
+        Return:
+            - the list of nodes (including the source and `target`)
+            - the cost of the path
+        """
+        self.settle(target)
+        if self.dist[target] == INFINITY:
+            return [], INFINITY
+
+        path_to_target: list[int] = []
+        next_node = target
+        while next_node != -1:
+            path_to_target.append(next_node)
+            next_node = self.predecessor[next_node]
+
+        path_to_target.reverse()
+
+        return path_to_target, self.dist[target]
+
+
+def find_shortest_path_tree(
+        graph: dict[int, dict[int, float]],
+        source: int
+) -> tuple[list[float], list[int]]:
+    """
+    One-to-all Dijkstra from `source`.
+
+    Return:
+        - the cost of the shortest path to each node (infinity if unreachable)
+        - each node's predecessor on that path (-1 for `source` and unreachable nodes)
+    """
+    tree = ShortestPathTree(graph, source)
+    tree.settle()
+    return tree.dist, tree.predecessor
+
+
+class ShortestPathCache:
+    """
+    Keeps the ShortestPathTree of the `maxsize` most recently queried sources,
+    so queries that share a source share one (resumable) search.
+
+    After changing the graph in place, call invalidate() to drop every tree built on the old one.
+    """
+
+    def __init__(self, graph: dict[int, dict[int, float]], maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError('The cache must hold at least one tree')
+        self.graph = graph
+        self.maxsize = maxsize
+        self.trees: OrderedDict[int, ShortestPathTree] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        self.trees.clear()
+
+    def tree(self, source: int) -> ShortestPathTree:
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self.trees.move_to_end(source)
+            return tree
+
+        self.misses += 1
+        tree = ShortestPathTree(self.graph, source)
+        self.trees[source] = tree
+        if len(self.trees) > self.maxsize:
+            self.trees.popitem(last=False)
+        return tree
+
+    def find_shortest_path(self, source: int, target: int) -> tuple[list[int], float]:
+        return self.tree(source).path_to(target)
+
+    def distances(self, source: int) -> tuple[list[float], list[int]]:
+        """
+        Same as find_shortest_path_tree, from the cache.
+        """
+        tree = self.tree(source)
+        tree.settle()
+        return tree.dist, tree.predecessor
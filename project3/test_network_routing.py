@@ -1,6 +1,12 @@
+import random
+
 from byu_pytest_utils import max_score, with_import
 
 from main import generate_graph
+from generate import generate_graph_csr
+from csr_graph import CSRGraph
+from dary_heap_priority_queue import DaryHeapPriorityQueue
+from contraction_hierarchy import ContractionHierarchy
 
 
 def tiny_test(finder):
@@ -66,3 +72,424 @@ def test_large_network_heap(find_shortest_path_with_heap):
 @with_import('network_routing')
 def test_large_network_array(find_shortest_path_with_array):
     large_test(find_shortest_path_with_array)
+
+
+def on_csr(finder):
+    return lambda graph, source, target: finder(CSRGraph.from_dict(graph), source, target)
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_tiny_network_heap_csr(find_shortest_path_with_heap_csr):
+    tiny_test(on_csr(find_shortest_path_with_heap_csr))
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_large_network_heap_csr(find_shortest_path_with_heap_csr):
+    large_test(on_csr(find_shortest_path_with_heap_csr))
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_large_network_array_csr(find_shortest_path_with_array_csr):
+    large_test(on_csr(find_shortest_path_with_array_csr))
+
+
+@max_score(1)
+def test_csr_round_trip():
+    _, graph = generate_graph(312, 100, 0.1, 0.05)
+    csr = CSRGraph.from_dict(graph)
+    assert csr.to_dict() == graph
+
+    reversed_graph = {node: {} for node in graph}
+    for source, edges in graph.items():
+        for target, weight in edges.items():
+            reversed_graph[target][source] = weight
+    assert csr.reverse().to_dict() == reversed_graph
+
+
+@max_score(1)
+def test_generate_graph_csr():
+    positions, graph = generate_graph_csr(312, 3000, 0.05, 0.05)
+    _, chunked = generate_graph_csr(312, 3000, 0.05, 0.05, chunk_size=1024)
+    assert positions.shape == (3000, 2)
+    assert (graph.indices == chunked.indices).all()
+    assert (graph.weights == chunked.weights).all()
+
+    for node in [0, 1500, 2999]:
+        targets, weights = graph.neighbors(node)
+        assert len(set(targets.tolist())) == len(targets) == 150
+        assert (weights >= 0).all()
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_tiny_network_bidirectional(find_shortest_path_bidirectional):
+    tiny_test(find_shortest_path_bidirectional)
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_large_network_bidirectional(find_shortest_path_bidirectional):
+    large_test(find_shortest_path_bidirectional)
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_large_network_astar(find_shortest_path_astar):
+    from network_routing import admissible_scale
+    positions, graph = generate_graph(312, 1000, 0.2, 0.05)
+    scale = min(1.0, admissible_scale(graph, positions))
+    large_test(lambda graph, source, target: find_shortest_path_astar(graph, positions, source, target, scale))
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_weighted_astar_bound(find_shortest_path_astar):
+    from network_routing import find_shortest_path_with_heap
+    from network_routing import admissible_scale
+    positions, graph = generate_graph(312, 2000, 0.002, 0)
+    scale = min(1.0, admissible_scale(graph, positions))
+    for target in range(10, 2000, 199):
+        _, optimal = find_shortest_path_with_heap(graph, 0, target)
+        path, cost = find_shortest_path_astar(graph, positions, 0, target, scale, weight=2)
+        assert optimal <= cost <= 2 * optimal
+
+
+@max_score(2)
+def test_dary_heap():
+    rng = random.Random(312)
+    for arity in [2, 3, 8]:
+        pq = DaryHeapPriorityQueue(arity)
+        pq.make(range(100))
+        expected = {}
+        for _ in range(5000):
+            if rng.random() < 0.6:
+                node = rng.randrange(100)
+                expected[node] = rng.random()
+                pq.update(expected[node], node)
+            elif expected:
+                distance, node = pq.pop_min()
+                assert distance == min(expected.values()) == expected.pop(node)
+        assert pq.size() == len(expected)
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_large_network_dary_heap(_find_shortest_path_csr):
+    large_test(lambda graph, source, target: _find_shortest_path_csr(
+        CSRGraph.from_dict(graph), source, target, DaryHeapPriorityQueue(4)
+    ))
+
+
+@max_score(3)
+@with_import('network_routing')
+def test_priority_queue_strategies(find_shortest_path):
+    from network_routing import PRIORITY_QUEUES
+    for queue in PRIORITY_QUEUES:
+        tiny_test(lambda graph, source, target: find_shortest_path(graph, source, target, queue))
+        large_test(lambda graph, source, target: find_shortest_path(graph, source, target, queue))
+
+    # Heavy edges leave long runs of empty buckets in the bucket queue
+    import time
+    heavy = {0: {1: 500000.0}, 1: {2: 500000.0, 0: 1.0}, 2: {}}
+    for queue in PRIORITY_QUEUES:
+        start = time.perf_counter()
+        assert find_shortest_path(heavy, 0, 2, queue) == ([0, 1, 2], 1000000.0)
+        assert time.perf_counter() - start < 1
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_large_network_delta_stepping(find_shortest_path_delta_stepping):
+    tiny_test(find_shortest_path_delta_stepping)
+    large_test(find_shortest_path_delta_stepping)
+    large_test(lambda graph, source, target: find_shortest_path_delta_stepping(graph, source, target, delta=1))
+
+
+@max_score(3)
+@with_import('parallel_routing')
+def test_parallel_delta_stepping(ParallelDeltaStepping):
+    import parallel_routing
+    from network_routing import find_shortest_path_with_heap
+    _, graph = generate_graph(312, 1000, 0.2, 0.05)
+    csr = CSRGraph.from_dict(graph)
+    expected = [find_shortest_path_with_heap(graph, 2, target)[1] for target in range(0, 1000, 50)]
+
+    threshold = parallel_routing.PARALLEL_THRESHOLD
+    parallel_routing.PARALLEL_THRESHOLD = 0  # send every bucket to the pool
+    try:
+        for workers in [1, 2]:
+            with ParallelDeltaStepping(csr, workers) as engine:
+                large_test(lambda _, source, target: engine.shortest_path(source, target))
+                dist, _ = engine.distances(2)
+                assert [round(d, 9) for d in dist[::50]] == [round(d, 9) for d in expected]
+    finally:
+        parallel_routing.PARALLEL_THRESHOLD = threshold
+
+
+@max_score(3)
+def test_contraction_hierarchy(tmp_path):
+    from network_routing import find_shortest_path_with_heap
+    tiny_test(lambda graph, source, target: ContractionHierarchy.build(graph).shortest_path(source, target))
+
+    _, graph = generate_graph(312, 300, 0.01, 0.05)
+    hierarchy = ContractionHierarchy.build(graph)
+    hierarchy.save(tmp_path / 'hierarchy.npz')
+    loaded = ContractionHierarchy.load(tmp_path / 'hierarchy.npz')
+    # Stopping early leaves a large uncontracted core to search
+    cored = ContractionHierarchy.build(graph, core_degree=3)
+    assert cored.num_shortcuts < hierarchy.num_shortcuts
+
+    rng = random.Random(312)
+    for _ in range(100):
+        source, target = rng.randrange(300), rng.randrange(300)
+        path, cost = find_shortest_path_with_heap(graph, source, target)
+        assert hierarchy.shortest_path(source, target) == loaded.shortest_path(source, target)
+        for found_path, found_cost in (hierarchy.shortest_path(source, target), cored.shortest_path(source, target)):
+            assert found_cost == cost
+            assert found_path == path or sum(graph[a][b] for a, b in zip(found_path, found_path[1:])) == cost
+
+
+@max_score(3)
+@with_import('landmarks')
+def test_alt_landmarks(find_shortest_path_alt):
+    from landmarks import Landmarks
+    from network_routing import find_shortest_path_with_heap
+    _, graph = generate_graph(312, 1000, 0.2, 0.05)
+    large_test(lambda graph, source, target: find_shortest_path_alt(graph, Landmarks.select(graph, 4), source, target))
+
+    # Heavy noise: straight-line distances overestimate, landmark bounds must not
+    _, graph = generate_graph(312, 500, 0.01, 0.5)
+    landmarks = Landmarks.select(graph, 6)
+    assert len(set(landmarks.landmarks)) == 6
+    rng = random.Random(312)
+    for _ in range(50):
+        source, target = rng.randrange(500), rng.randrange(500)
+        _, cost = find_shortest_path_with_heap(graph, source, target)
+        assert round(find_shortest_path_alt(graph, landmarks, source, target)[1], 9) == round(cost, 9)
+
+
+@max_score(3)
+@with_import('shortest_path_tree')
+def test_shortest_path_cache(ShortestPathCache):
+    from shortest_path_tree import find_shortest_path_tree
+    from network_routing import find_shortest_path_with_heap
+    _, graph = generate_graph(312, 1000, 0.2, 0.05)
+    cache = ShortestPathCache(graph, maxsize=2)
+    large_test(lambda _, source, target: cache.find_shortest_path(source, target))
+
+    # A farther target resumes the search started for node 9
+    tree = cache.tree(2)
+    settled = sum(tree.settled)
+    dist, predecessor = find_shortest_path_tree(graph, 2)
+    for target in range(0, 1000, 37):
+        assert cache.find_shortest_path(2, target) == find_shortest_path_with_heap(graph, 2, target)
+        assert cache.find_shortest_path(2, target)[1] == dist[target]
+    assert cache.tree(2) is tree and sum(tree.settled) > settled
+    assert cache.distances(2) == (dist, predecessor)
+
+    # Least recently used trees are dropped, and invalidate() drops the rest
+    cache.tree(3)
+    cache.tree(4)
+    assert cache.tree(2) is not tree
+    old = cache.tree(4)
+    cache.invalidate()
+    assert not cache.trees
+    assert cache.tree(4) is not old
+
+
+@max_score(3)
+def test_graph_file(tmp_path):
+    import numpy as np
+    from graph_file import save_graph, save_generated_graph, load_graph
+    from network_routing import find_shortest_path_with_heap_csr
+    positions, graph = generate_graph(312, 1000, 0.2, 0.05)
+    save_graph(tmp_path / 'graph.bin', CSRGraph.from_dict(graph), positions)
+    loaded_positions, loaded = load_graph(tmp_path / 'graph.bin')
+    assert isinstance(loaded.indices, np.memmap) or isinstance(loaded.indices.base, np.memmap)
+    assert np.allclose(loaded_positions, positions)
+    path, cost = find_shortest_path_with_heap_csr(loaded, 2, 9)
+    assert path == [2, 391, 90, 956, 227, 236, 133, 429, 697, 846, 148, 775, 359, 685, 335, 102, 315, 9]
+    assert round(cost, 2) == 1.12
+
+    # Written chunk by chunk, it matches the in-memory generator up to float32 rounding
+    save_generated_graph(tmp_path / 'generated.bin', 312, 5000, 0.001, 0.02, chunk_size=1024)
+    positions, generated = load_graph(tmp_path / 'generated.bin')
+    expected_positions, expected = generate_graph_csr(312, 5000, 0.001, 0.02)
+    assert np.array_equal(generated.indptr, expected.indptr)
+    assert np.array_equal(generated.indices, expected.indices)
+    assert np.array_equal(generated.weights, expected.weights.astype(np.float32))
+    assert np.array_equal(positions, expected_positions.astype(np.float32))
+
+    save_graph(tmp_path / 'bare.bin', expected)
+    assert load_graph(tmp_path / 'bare.bin')[0] is None
+
+
+@max_score(3)
+@with_import('batch_routing')
+def test_batch_routing(route_batch):
+    from network_routing import find_shortest_path_with_heap
+    from search_stats import BatchStats
+    _, graph = generate_graph(312, 1000, 0.2, 0.05)
+    csr = CSRGraph.from_dict(graph)
+    rng = random.Random(312)
+    queries = [(rng.choice([2, 5, 7]), rng.randrange(1000)) for _ in range(30)] + [(2, 9), (4, 4)]
+    expected = [find_shortest_path_with_heap(graph, source, target) for source, target in queries]
+
+    for workers in [1, 2]:
+        stats = BatchStats()
+        results = list(route_batch(csr, queries, workers, sources_per_task=1, stats=stats))
+        assert [cost for _, cost in results] == [cost for _, cost in expected]
+        assert results[-2] == expected[-2] and results[-1] == ([4], 0)
+        assert stats.n_queries == 32 and stats.n_searches == 4 and stats.queries_per_second > 0
+
+
+@max_score(3)
+@with_import('routing_server')
+def test_routing_server(RoutingServer):
+    import asyncio
+    import json
+    from routing_server import generate_load
+    from network_routing import find_shortest_path_with_heap
+    _, graph = generate_graph(312, 1000, 0.2, 0.05)
+    rng = random.Random(312)
+    queries = [(rng.choice([2, 5, 7]), rng.randrange(1000)) for _ in range(60)] + [(2, 9)]
+
+    async def run():
+        # A tiny queue so the connections are pushed back on
+        async with RoutingServer(CSRGraph.from_dict(graph), workers=1, max_pending=4) as server:
+            host, port = await server.start()
+            result = await generate_load(host, port, queries, connections=4)
+
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b'{"id": 1, "source": 2}\n{"id": 2, "source": 2, "target": 5000}\n')
+            errors = [json.loads(await reader.readline()) for _ in range(2)]
+
+            # A search that fails is answered with its error
+            server.pool.shutdown()
+            writer.write(b'{"id": 3, "source": 2, "target": 5}\n')
+            errors.append(json.loads(await reader.readline()))
+            writer.close()
+            return result, errors
+
+    async def close_while_searching():
+        # Closing cancels the searches still running and leaves no task behind
+        server = RoutingServer(CSRGraph.from_dict(graph), workers=1)
+        host, port = await server.start()
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b''.join(b'{"id": %d, "source": %d, "target": 9}\n' % (i, i) for i in range(20)))
+        while not server.searches:
+            await asyncio.sleep(0.001)
+        await server.close()
+        await asyncio.sleep(0)
+        writer.close()
+        return server.searches, asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(close_while_searching()) == (set(), set())
+
+    result, errors = asyncio.run(run())
+    for (source, target), answer in zip(queries, result['answers']):
+        path, cost = find_shortest_path_with_heap(graph, source, target)
+        assert answer['cost'] == cost and answer['path'][0] == source and answer['path'][-1] == target
+    assert result['answers'][-1]['path'] == [2, 391, 90, 956, 227, 236, 133, 429, 697, 846, 148, 775, 359, 685, 335, 102, 315, 9]
+
+    stats = result['stats']
+    assert stats['requests'] == len(queries)
+    assert stats['searches'] < len(queries)  # requests sharing a source were coalesced
+    assert sum(stats['latency_ms']['buckets'].values()) == len(queries)
+    assert [error['id'] for error in errors] == [1, 2, 3] and all('error' in error for error in errors)
+
+
+@max_score(3)
+@with_import('dynamic_sssp')
+def test_dynamic_shortest_paths(DynamicShortestPaths):
+    import math
+    from shortest_path_tree import find_shortest_path_tree
+    _, graph = generate_graph(312, 300, 0.02, 0.05)
+    dynamic = DynamicShortestPaths(graph, 2)
+    rng = random.Random(312)
+    for step in range(300):
+        u = rng.randrange(300)
+        if graph[u] and rng.random() < 0.7:
+            v = rng.choice(list(graph[u]))
+            # Mostly bump the weights of tree edges, where repairs actually happen
+            if rng.random() < 0.5 and u != 2 and dynamic.predecessor[u] != -1:
+                v, u = u, dynamic.predecessor[u]
+            change = rng.choice(['increase', 'decrease', 'remove'])
+            if change == 'remove':
+                dynamic.remove_edge(u, v)
+            else:
+                factor = rng.uniform(1, 3) if change == 'increase' else rng.uniform(0, 1)
+                dynamic.update_edge(u, v, graph[u][v] * factor)
+        else:
+            dynamic.update_edge(u, rng.randrange(300), rng.uniform(0, 1))
+
+        if step % 10 == 0:
+            expected, _ = find_shortest_path_tree(graph, 2)
+            assert all(math.isclose(a, b, abs_tol=1e-9) for a, b in zip(dynamic.dist, expected))
+            for target in range(0, 300, 30):
+                path, cost = dynamic.path_to(target)
+                assert math.isclose(sum(graph[a][b] for a, b in zip(path, path[1:])), cost, abs_tol=1e-9) if path \
+                    else cost == expected[target] == float('inf')
+
+    # A dearer edge outside the tree touches nothing
+    u, v = next((u, v) for u in graph for v in graph[u] if dynamic.predecessor[v] != u)
+    assert dynamic.update_edge(u, v, graph[u][v] + 1) == 0
+
+
+@max_score(2)
+@with_import('network_routing')
+def test_search_stats(find_shortest_path_with_heap):
+    from network_routing import find_shortest_path_with_array
+    from search_stats import SearchStats
+    heap_stats = SearchStats()
+    array_stats = SearchStats()
+    large_test(lambda graph, source, target: find_shortest_path_with_heap(graph, source, target, heap_stats))
+    large_test(lambda graph, source, target: find_shortest_path_with_array(graph, source, target, array_stats))
+
+    for stats in (heap_stats, array_stats):
+        assert 0 < stats.n_nodes_settled <= 1000
+        assert stats.n_decrease_keys <= stats.n_edges_relaxed
+        # Nodes waiting at infinity are not counted, so the queue never holds all 1000
+        assert 0 < stats.max_queue_size < 1000
+        assert stats.n_sift_steps > 0 and stats.search_time > 0
+    assert heap_stats.n_nodes_settled == array_stats.n_nodes_settled
+    assert heap_stats.n_edges_relaxed == array_stats.n_edges_relaxed
+    assert heap_stats.max_queue_size == array_stats.max_queue_size
+    # A heap sift is O(log n); an array scan is O(n)
+    assert heap_stats.n_sift_steps < array_stats.n_sift_steps
+
+    # The CSR search counts the same work
+    from network_routing import find_shortest_path_with_heap_csr
+    _, graph = generate_graph(312, 1000, 0.2, 0.05)
+    dict_stats, csr_stats = SearchStats(), SearchStats()
+    find_shortest_path_with_heap(graph, 2, 9, dict_stats)
+    find_shortest_path_with_heap_csr(CSRGraph.from_dict(graph), 2, 9, csr_stats)
+    assert (csr_stats.n_nodes_settled, csr_stats.n_edges_relaxed, csr_stats.max_queue_size) == \
+           (dict_stats.n_nodes_settled, dict_stats.n_edges_relaxed, dict_stats.max_queue_size)
+
+
+@max_score(2)
+@with_import('benchmark')
+def test_benchmark_sweep(run_sweep):
+    import os
+    import subprocess
+    import sys
+    from benchmark import FINDERS
+    rows = run_sweep([300], [0.02], [0, 0.05], list(FINDERS), queries=3, trials=1, seed=312)
+    assert len(rows) == 2 * len(FINDERS)
+    for noise in [0, 0.05]:
+        costs = {row['total_cost'] for row in rows if row['noise'] == noise}
+        assert len(costs) == 1  # every finder is exact
+    assert all(row['generate_time'] > 0 and row['peak_memory'] > 0 for row in rows)
+    assert all(row['dict_bytes_estimate'] > row['csr_bytes'] for row in rows)
+
+    # CSR finders alone never need the dict graph
+    rows = run_sweep([300], [0.02], [0], ['heap_csr', 'array_csr'], queries=3, trials=1, seed=312)
+    assert all(row['to_dict_time'] is None for row in rows)
+
+    # Plotting must stay out of the harness
+    check = "import sys, benchmark; sys.exit('matplotlib' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', check], cwd=os.path.dirname(__file__)).returncode == 0